@@ -10,14 +10,16 @@ __author__ = "AV1 to HEVC Converter Team"
 __license__ = "MIT"
 
 from .config import Config
-from .converter import VideoConverter, BatchConverter, ConversionProgress
-from .utils import VideoUtils, setup_logging
+from .converter import VideoConverter, BatchConverter, ConversionProgress, FileResult
+from .utils import VideoUtils, ProbeCache, setup_logging
 
 __all__ = [
     "Config",
     "VideoConverter", 
     "BatchConverter",
     "ConversionProgress",
+    "FileResult",
     "VideoUtils",
+    "ProbeCache",
     "setup_logging"
 ] 
\ No newline at end of file
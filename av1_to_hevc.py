@@ -11,9 +11,10 @@ Supported codecs:
 """
 
 import sys
+import threading
 import time
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
 import click
 from colorama import init, Fore, Style
@@ -21,7 +22,7 @@ from tqdm import tqdm
 
 from config import Config, SUPPORTED_CODECS, CODEC_ENCODERS
 from converter import VideoConverter, BatchConverter, ConversionProgress
-from utils import VideoUtils, setup_logging
+from utils import VideoUtils, ProbeCache, setup_logging
 
 # Initialize colorama for cross-platform colored output
 init(autoreset=True)
@@ -32,7 +33,13 @@ class ProgressDisplay:
     
     def __init__(self):
         self.current_pbar: Optional[tqdm] = None
+        self.current_file: Optional[str] = None
         self.batch_pbar: Optional[tqdm] = None
+        # One bar per file converting in a batch, keyed by file name, and the line each sits on
+        self.file_pbars: Dict[str, tqdm] = {}
+        self._file_positions: Dict[str, int] = {}
+        # Batch conversions report progress from several worker threads
+        self._lock = threading.Lock()
         
     def setup_batch_progress(self, total_files: int):
         """Set up progress bar for batch conversion."""
@@ -57,25 +64,56 @@ class ProgressDisplay:
             colour='blue',
             leave=False
         )
+        self.current_file = filename
+    
+    def update_batch_file_progress(self, filename: str, completed: int, total: int,
+                                   progress: ConversionProgress):
+        """Update batch and file progress from a batch callback; safe to call from any thread."""
+        with self._lock:
+            if self.batch_pbar and (self.batch_pbar.n, self.batch_pbar.total) != (completed, total):
+                self.batch_pbar.total = total
+                self.batch_pbar.n = completed
+                self.batch_pbar.refresh()
+            
+            # Each file converting in parallel gets its own bar below the batch bar
+            pbar = self.file_pbars.get(filename)
+            if pbar is None:
+                used = set(self._file_positions.values())
+                position = next(pos for pos in range(1, len(used) + 2) if pos not in used)
+                pbar = tqdm(total=100, desc=f"Converting {filename}", unit="%",
+                            position=position, colour='blue', leave=False)
+                self.file_pbars[filename] = pbar
+                self._file_positions[filename] = position
+            
+            self._show_progress(pbar, filename, progress)
+            
+            # The batch reports 100% once more as each file finishes
+            if progress.percentage >= 100:
+                pbar.close()
+                del self.file_pbars[filename]
+                del self._file_positions[filename]
     
     def update_file_progress(self, progress: ConversionProgress):
         """Update file conversion progress."""
         if self.current_pbar:
-            # Update progress bar
-            current_progress = int(progress.percentage)
-            self.current_pbar.n = current_progress
-            
-            # Update description with detailed info
-            desc_parts = [f"Converting"]
-            if progress.fps > 0:
-                desc_parts.append(f"{progress.fps:.1f} fps")
-            if progress.speed:
-                desc_parts.append(f"{progress.speed}")
-            if progress.time:
-                desc_parts.append(f"[{progress.time}]")
-            
-            self.current_pbar.set_description(" | ".join(desc_parts))
-            self.current_pbar.refresh()
+            self._show_progress(self.current_pbar, self.current_file, progress)
+    
+    @staticmethod
+    def _show_progress(pbar: tqdm, filename: Optional[str], progress: ConversionProgress):
+        """Move a file progress bar and describe the encode's speed on it."""
+        pbar.n = int(progress.percentage)
+        
+        # Update description with detailed info
+        desc_parts = [f"Converting {filename}" if filename else "Converting"]
+        if progress.fps > 0:
+            desc_parts.append(f"{progress.fps:.1f} fps")
+        if progress.speed:
+            desc_parts.append(f"{progress.speed}")
+        if progress.time:
+            desc_parts.append(f"[{progress.time}]")
+        
+        pbar.set_description(" | ".join(desc_parts))
+        pbar.refresh()
     
     def finish_file(self):
         """Finish current file progress."""
@@ -84,12 +122,15 @@ class ProgressDisplay:
             self.current_pbar.refresh()
             self.current_pbar.close()
             self.current_pbar = None
-            
-        if self.batch_pbar:
-            self.batch_pbar.update(1)
+            self.current_file = None
     
     def finish_batch(self):
         """Finish batch progress."""
+        for pbar in self.file_pbars.values():
+            pbar.close()
+        self.file_pbars.clear()
+        self._file_positions.clear()
+        
         if self.batch_pbar:
             self.batch_pbar.close()
             self.batch_pbar = None
@@ -284,8 +325,11 @@ def batch(directory, input_codec, output_codec, output, quality, no_hdr, verbose
         click.echo(f"{Fore.RED}Error: FFmpeg not found. Please install FFmpeg and add it to PATH.")
         sys.exit(1)
     
+    # Probe each file once and share the results with the batch converter
+    probe_cache = ProbeCache()
+    
     # Find videos
-    videos = VideoUtils.find_videos_by_codec(directory, input_codec)
+    videos = VideoUtils.find_videos_by_codec(directory, input_codec, probe_cache)
     
     if not videos:
         if input_codec:
@@ -295,10 +339,11 @@ def batch(directory, input_codec, output_codec, output, quality, no_hdr, verbose
             click.echo(f"{Fore.YELLOW}No videos found in {directory}")
         return
     
-    # Filter out videos already in target codec
+    # Filter out videos already in target codec, probing all of them concurrently
+    video_infos = probe_cache.prefetch(videos)
     videos_to_convert = []
     for video in videos:
-        video_codec = VideoUtils.get_video_codec(video)
+        video_codec = VideoUtils.get_video_codec(video, video_infos[video] or {})
         if video_codec != output_codec:
             videos_to_convert.append(video)
     
@@ -307,8 +352,10 @@ def batch(directory, input_codec, output_codec, output, quality, no_hdr, verbose
         return
     
     # Display summary
-    total_size = sum(VideoUtils.get_file_size_mb(f) for f in videos_to_convert)
-    hdr_count = sum(1 for f in videos_to_convert if VideoUtils.has_hdr_metadata(f))
+    # Stat each file once for both the total and the dry run listing
+    sizes = {f: VideoUtils.get_file_size_mb(f) for f in videos_to_convert}
+    total_size = sum(sizes.values())
+    hdr_count = sum(1 for f in videos_to_convert if VideoUtils.has_hdr_metadata(f, probe_cache.get_info(f)))
     
     output_codec_name = VideoUtils.get_codec_display_name(output_codec)
     
@@ -322,12 +369,13 @@ def batch(directory, input_codec, output_codec, output, quality, no_hdr, verbose
     if dry_run:
         click.echo(f"\n{Fore.YELLOW}Dry run - files that would be converted:")
         for video in videos_to_convert:
-            video_codec = VideoUtils.get_video_codec(video)
-            output_path = VideoUtils.generate_output_path(video, output, output_codec)
-            size_mb = VideoUtils.get_file_size_mb(video)
-            hdr_indicator = " [HDR]" if VideoUtils.has_hdr_metadata(video) else ""
+            video_info = probe_cache.get_info(video)
+            video_codec = VideoUtils.get_video_codec(video, video_info)
+            output_name = VideoUtils.generate_output_name(video, output_codec, input_codec=video_codec)
+            size_mb = sizes[video]
+            hdr_indicator = " [HDR]" if VideoUtils.has_hdr_metadata(video, video_info) else ""
             codec_info = f"[{VideoUtils.get_codec_display_name(video_codec)}]"
-            click.echo(f"  {video.name} {codec_info} ({size_mb:.1f} MB){hdr_indicator} → {output_path.name}")
+            click.echo(f"  {video.name} {codec_info} ({size_mb:.1f} MB){hdr_indicator} → {output_name}")
         return
     
     # Ask for confirmation
@@ -337,7 +385,7 @@ def batch(directory, input_codec, output_codec, output, quality, no_hdr, verbose
     
     # Initialize converter and progress display
     config = Config()
-    batch_converter = BatchConverter(config)
+    batch_converter = BatchConverter(config, probe_cache=probe_cache)
     progress_display = ProgressDisplay()
     
     # Display encoder info
@@ -352,15 +400,14 @@ def batch(directory, input_codec, output_codec, output, quality, no_hdr, verbose
     # Set up progress display
     progress_display.setup_batch_progress(len(videos_to_convert))
     
-    def batch_progress_callback(filename: str, current: int, total: int, progress: ConversionProgress):
-        if not progress_display.current_pbar or progress_display.current_pbar.desc != f"Converting {filename}":
-            progress_display.setup_file_progress(filename)
-        progress_display.update_file_progress(progress)
+    def batch_progress_callback(filename: str, completed: int, total: int, progress: ConversionProgress):
+        progress_display.update_batch_file_progress(filename, completed, total, progress)
     
     # Start batch conversion
     start_time = time.time()
     results = batch_converter.convert_directory(
-        directory, output, input_codec, output_codec, quality, not no_hdr, batch_progress_callback
+        directory, output, input_codec, output_codec, quality, not no_hdr, batch_progress_callback,
+        video_files=videos_to_convert
     )
     
     # Clean up progress display
@@ -380,8 +427,8 @@ def batch(directory, input_codec, output_codec, output, quality, no_hdr, verbose
     if results['failed'] > 0:
         click.echo(f"\n{Fore.RED}Failed conversions:")
         for file_info in results['files']:
-            if file_info['status'] in ['failed', 'error']:
-                click.echo(f"  {Path(file_info['input']).name}")
+            if file_info.status in ['failed', 'error']:
+                click.echo(f"  {Path(file_info.input).name}")
 
 
 @cli.command()
@@ -420,6 +467,18 @@ def info():
         click.echo(f"  • {codec_info['name']}")
 
 
+@cli.command('reset-hdr-blacklist')
+def reset_hdr_blacklist():
+    """Re-enable HDR preservation for encoders that previously rejected it."""
+    setup_logging(False)
+    
+    removed = Config().clear_hdr_blacklist()
+    if removed:
+        click.echo(f"{Fore.GREEN}Cleared {removed} HDR blacklist entr{'y' if removed == 1 else 'ies'}")
+    else:
+        click.echo(f"{Fore.YELLOW}HDR blacklist is already empty")
+
+
 @cli.command()
 def gui():
     """Launch the graphical user interface."""
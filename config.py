@@ -3,10 +3,13 @@ Configuration module for video converter.
 Handles encoding parameters, GPU detection, and quality settings for multiple codecs.
 """
 
+import os
 import subprocess
 import logging
 import json
-from typing import Dict, List, Optional, Tuple
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
 
 # Supported input and output codecs
 SUPPORTED_CODECS = {
@@ -45,6 +48,39 @@ HDR_PARAMS = {
     }
 }
 
+# Default number of videos converted concurrently in batch mode
+# (each conversion gets roughly four cores to itself)
+DEFAULT_MAX_PARALLEL = max(1, (os.cpu_count() or 1) // 4)
+
+# Default when a GPU encoder is available; consumer GPUs only run a few
+# hardware encode sessions at once and extra ones fail or queue
+DEFAULT_GPU_MAX_PARALLEL = 2
+
+# Concurrent ffprobe processes used when scanning a directory
+MAX_PROBE_WORKERS = 16
+
+# ffprobe arguments preceding the input path, listing every stream and the full format section
+FFPROBE_ARGS = ('ffprobe', '-v', 'quiet', '-print_format', 'json', '-show_streams', '-show_format')
+
+# Narrower probe used for conversions and scans: only the first video stream and the
+# container duration are ever read, so audio/subtitle streams and format tags are left out
+FFPROBE_VIDEO_ARGS = ('ffprobe', '-v', 'quiet', '-print_format', 'json', '-select_streams', 'v:0',
+                      '-show_streams', '-show_entries', 'format=duration')
+
+# Threads used to walk subdirectories when searching for videos
+MAX_SCAN_WORKERS = 8
+
+# Directories never searched for videos (hidden, dot-prefixed directories are skipped too)
+SCAN_SKIP_DIRS = frozenset({
+    'node_modules', '__pycache__', '$RECYCLE.BIN', 'System Volume Information',
+})
+
+# Packets buffered between the demuxer and decoder (FFmpeg's default of 8 stalls on 4K inputs)
+DEFAULT_THREAD_QUEUE_SIZE = 512
+
+# Persisted (encoder, HDR profile) combinations that rejected HDR metadata
+HDR_BLACKLIST_PATH = Path.home() / ".cache" / "av1-to-hevc" / "hdr_blacklist.json"
+
 # Encoder configurations for different codecs
 CODEC_ENCODERS = {
     "hevc": {
@@ -136,14 +172,53 @@ CODEC_ENCODERS = {
     }
 }
 
+# Hardware decoders paired with each GPU encoder family: (hwaccel, hwaccel_output_format).
+# An output format keeps decoded frames in GPU memory for the encoder.
+HWACCEL_METHODS = {
+    "nvidia": ("cuda", "cuda"),
+    "intel": ("qsv", "qsv"),
+    "amd": ("d3d11va", None),
+}
+
+# Container extension used for each output codec
+CODEC_EXTENSIONS = {
+    "hevc": ".mkv",
+    "h264": ".mp4",
+    "av1": ".mkv",
+    "vp9": ".webm",
+}
+
 
 class Config:
     """Configuration class for video conversion settings."""
     
-    def __init__(self):
+    def __init__(self, max_parallel: Optional[int] = None, ffmpeg_threads: Optional[int] = None,
+                 disk_concurrency: Optional[int] = None):
+        """
+        Initialize the configuration.
+        
+        Args:
+            max_parallel: Maximum concurrent conversions in batch mode (defaults to
+                DEFAULT_GPU_MAX_PARALLEL with a GPU encoder, else DEFAULT_MAX_PARALLEL)
+            ffmpeg_threads: Threads per FFmpeg process for CPU encoders (None derives it from parallelism)
+            disk_concurrency: Maximum conversions reading/writing the same drives at once
+                (None means 1 on spinning disks, unlimited otherwise)
+        """
         self.logger = logging.getLogger(__name__)
+        self.ffmpeg_threads = ffmpeg_threads
+        self.disk_concurrency = disk_concurrency
+        self.thread_queue_size = DEFAULT_THREAD_QUEUE_SIZE
+        self._lock = threading.Lock()
         self.gpu_type = self._detect_gpu()
+        default_parallel = DEFAULT_GPU_MAX_PARALLEL if self.gpu_type else DEFAULT_MAX_PARALLEL
+        self.max_parallel = max(1, max_parallel or default_parallel)
         self.available_encoders = self._detect_available_encoders()
+        self.available_hwaccels = self._detect_hwaccels() if self.gpu_type else set()
+        self.hdr_blacklist = self._load_hdr_blacklist()
+        # (hwaccel, input codec) pairs whose hardware decoding failed this session
+        self.hwaccel_blacklist: Set[Tuple[str, str]] = set()
+        self._params_templates: Dict[Tuple, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {}
+        self._encoder_configs: Dict[Tuple[str, bool], Tuple[str, Dict]] = {}
         
     def _detect_gpu(self) -> Optional[str]:
         """Detect available GPU and return type (nvidia/amd/intel) or None."""
@@ -151,7 +226,7 @@ class Config:
             # Check for NVIDIA GPU
             result = subprocess.run(
                 ["ffmpeg", "-hide_banner", "-encoders"],
-                capture_output=True, text=True, timeout=10
+                capture_output=True, text=True, encoding='utf-8', errors='replace', timeout=10
             )
             
             if "hevc_nvenc" in result.stdout or "h264_nvenc" in result.stdout:
@@ -177,7 +252,7 @@ class Config:
         try:
             result = subprocess.run(
                 ["ffmpeg", "-hide_banner", "-encoders"],
-                capture_output=True, text=True, timeout=10
+                capture_output=True, text=True, encoding='utf-8', errors='replace', timeout=10
             )
             
             encoders_output = result.stdout
@@ -205,6 +280,56 @@ class Config:
         
         return available
     
+    def _detect_hwaccels(self) -> Set[str]:
+        """Detect which hardware decoding methods FFmpeg supports."""
+        try:
+            result = subprocess.run(
+                ["ffmpeg", "-hide_banner", "-hwaccels"],
+                capture_output=True, text=True, encoding='utf-8', errors='replace', timeout=10
+            )
+            
+            # First line is the "Hardware acceleration methods:" header
+            return {line.strip() for line in result.stdout.splitlines()[1:] if line.strip()}
+            
+        except (subprocess.TimeoutExpired, subprocess.CalledProcessError, FileNotFoundError):
+            self.logger.warning("Could not detect hardware decoders")
+            return set()
+    
+    def get_hwaccel_for(self, output_codec: str) -> Optional[Tuple[str, Optional[str]]]:
+        """
+        Get the hardware decoder to pair with the encoder used for a codec.
+        
+        Args:
+            output_codec: Target codec (hevc, h264, av1, vp9)
+            
+        Returns:
+            Tuple of (hwaccel, hwaccel_output_format) or None to decode on the CPU
+        """
+        encoder_type, _ = self.get_encoder_config(output_codec)
+        hwaccel = HWACCEL_METHODS.get(encoder_type)
+        if hwaccel and hwaccel[0] in self.available_hwaccels:
+            return hwaccel
+        return None
+    
+    def get_ffmpeg_threads(self, parallel_jobs: int = 1) -> Optional[int]:
+        """
+        Get the -threads value for each FFmpeg process.
+        
+        Splits the CPU cores between concurrent conversions so parallel
+        encoders don't oversubscribe the machine.
+        
+        Args:
+            parallel_jobs: Number of conversions running at the same time
+            
+        Returns:
+            Thread count, or None to let FFmpeg use every core
+        """
+        if self.ffmpeg_threads:
+            return self.ffmpeg_threads
+        if parallel_jobs <= 1:
+            return None
+        return max(1, (os.cpu_count() or 1) // parallel_jobs)
+    
     def get_encoder_config(self, output_codec: str, prefer_gpu: bool = True) -> Tuple[str, Dict]:
         """
         Get the best available encoder configuration for the given codec.
@@ -216,6 +341,12 @@ class Config:
         Returns:
             Tuple of (encoder_type, config_dict)
         """
+        # Encoder selection only depends on what was detected at startup
+        cached = self._encoder_configs.get((output_codec, prefer_gpu))
+        if cached is not None:
+            encoder_type, config = cached
+            return encoder_type, config.copy()
+        
         if output_codec not in CODEC_ENCODERS:
             raise ValueError(f"Unsupported output codec: {output_codec}")
         
@@ -235,27 +366,110 @@ class Config:
             encoder_type = "cpu"
             config = CODEC_ENCODERS[output_codec]["cpu"].copy()
         
+        self._encoder_configs[(output_codec, prefer_gpu)] = (encoder_type, config.copy())
         return encoder_type, config
     
-    def _detect_hdr_params(self, input_path: str) -> Dict[str, str]:
+    def _load_hdr_blacklist(self) -> Set[Tuple[str, str]]:
+        """Load encoder/HDR profile combinations known to fail with HDR metadata."""
+        try:
+            with open(HDR_BLACKLIST_PATH, 'r', encoding='utf-8') as f:
+                return {(encoder, profile) for encoder, profile in json.load(f)}
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError) as e:
+            self.logger.warning(f"Could not read HDR blacklist: {e}")
+        return set()
+    
+    def is_hdr_blacklisted(self, encoder: str, hdr_profile: str) -> bool:
+        """Check whether an encoder is known to reject the given HDR profile."""
+        return (encoder, hdr_profile) in self.hdr_blacklist
+    
+    def add_hdr_blacklist(self, encoder: str, hdr_profile: str) -> None:
+        """
+        Remember that an encoder rejected the given HDR profile.
+        
+        Args:
+            encoder: FFmpeg encoder name (e.g. hevc_qsv)
+            hdr_profile: HDR profile of the input (hdr10 or hlg)
+        """
+        # Conversions may run concurrently in batch mode
+        with self._lock:
+            if (encoder, hdr_profile) in self.hdr_blacklist:
+                return
+            
+            self.hdr_blacklist.add((encoder, hdr_profile))
+            try:
+                HDR_BLACKLIST_PATH.parent.mkdir(parents=True, exist_ok=True)
+                with open(HDR_BLACKLIST_PATH, 'w', encoding='utf-8') as f:
+                    json.dump(sorted(self.hdr_blacklist), f, indent=2)
+                self.logger.warning(f"{encoder} rejected {hdr_profile} metadata; future conversions will skip "
+                                    f"HDR preservation with it. Run 'python av1_to_hevc.py reset-hdr-blacklist' "
+                                    f"to undo.")
+            except OSError as e:
+                self.logger.warning(f"Could not save HDR blacklist: {e}")
+    
+    def clear_hdr_blacklist(self) -> int:
+        """
+        Forget every encoder/HDR profile combination recorded as failing.
+        
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            count = len(self.hdr_blacklist)
+            self.hdr_blacklist.clear()
+            try:
+                HDR_BLACKLIST_PATH.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                self.logger.warning(f"Could not remove HDR blacklist: {e}")
+            return count
+    
+    def is_hwaccel_blacklisted(self, hwaccel: str, input_codec: str) -> bool:
+        """Check whether a hardware decoder already failed on the given input codec."""
+        return (hwaccel, input_codec) in self.hwaccel_blacklist
+    
+    def add_hwaccel_blacklist(self, hwaccel: str, input_codec: str) -> None:
+        """
+        Remember that a hardware decoder can't decode the given input codec.
+        
+        Kept for this session only: unlike a rejected HDR profile, decoder failures
+        can come from a driver hiccup or too many GPU sessions at once.
+        
+        Args:
+            hwaccel: FFmpeg hwaccel method (e.g. cuda)
+            input_codec: Codec of the input (e.g. av1)
+        """
+        with self._lock:
+            if (hwaccel, input_codec) not in self.hwaccel_blacklist:
+                self.hwaccel_blacklist.add((hwaccel, input_codec))
+                self.logger.warning(f"{hwaccel} can't decode {input_codec}, decoding it in software from now on")
+    
+    def get_hdr_profile(self, input_path: str, video_info: Optional[Dict] = None) -> str:
+        """Get the HDR profile (hdr10 or hlg) of an input video file."""
+        hdr_params = self._detect_hdr_params(input_path, video_info)
+        return "hlg" if hdr_params['color_trc'] == 'arib-std-b67' else "hdr10"
+    
+    def _detect_hdr_params(self, input_path: str, video_info: Optional[Dict] = None) -> Dict[str, str]:
         """
         Detect HDR parameters from input video file.
         
         Args:
             input_path: Path to input video file
+            video_info: Already probed video information (skips running ffprobe)
             
         Returns:
             Dictionary with detected HDR parameters
         """
         try:
-            result = subprocess.run([
-                'ffprobe', '-v', 'quiet', '-print_format', 'json',
-                '-show_streams', input_path
-            ], capture_output=True, text=True, timeout=30)
+            if video_info is not None:
+                data = video_info
+            else:
+                result = subprocess.run(FFPROBE_VIDEO_ARGS + (str(input_path),), capture_output=True, text=True, encoding='utf-8', errors='replace', timeout=30)
+                data = json.loads(result.stdout) if result.returncode == 0 else None
             
-            if result.returncode == 0:
-                data = json.loads(result.stdout)
-                
+            if data:
                 for stream in data.get('streams', []):
                     if stream.get('codec_type') == 'video':
                         hdr_params = {}
@@ -308,7 +522,8 @@ class Config:
     def get_conversion_params(self, output_codec: str, preserve_hdr: bool = True, 
                             quality: Optional[int] = None, 
                             input_path: Optional[str] = None,
-                            prefer_gpu: bool = True) -> List[str]:
+                            prefer_gpu: bool = True,
+                            video_info: Optional[Dict] = None) -> List[str]:
         """
         Get FFmpeg parameters for video conversion.
         
@@ -318,10 +533,31 @@ class Config:
             quality: Override default quality setting
             input_path: Path to input file for HDR parameter detection
             prefer_gpu: Whether to prefer GPU encoding
+            video_info: Already probed input information used for HDR detection
             
         Returns:
             List of FFmpeg parameters
         """
+        key = (output_codec, preserve_hdr, quality, prefer_gpu)
+        template = self._params_templates.get(key)
+        if template is None:
+            template = self._params_templates[key] = self._build_params_template(*key)
+        head, tail = template
+        
+        params = list(head)
+        
+        # HDR preservation (if applicable); only hardware encoders need per-file values
+        if preserve_hdr and output_codec in ["hevc", "av1"]:  # H.264 has limited HDR support
+            encoder_type, _ = self.get_encoder_config(output_codec, prefer_gpu)
+            params.extend(self._get_hdr_params(encoder_type, input_path, video_info))
+        
+        params.extend(tail)
+        return params
+    
+    def _build_params_template(self, output_codec: str, preserve_hdr: bool,
+                               quality: Optional[int],
+                               prefer_gpu: bool) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+        """Build the file-independent parameters that go before and after the HDR parameters."""
         params = []
         encoder_type, config = self.get_encoder_config(output_codec, prefer_gpu)
         
@@ -338,9 +574,8 @@ class Config:
         elif output_codec == "vp9":
             params.extend(self._get_vp9_params(config, quality))
         
-        # HDR preservation (if applicable)
-        if preserve_hdr and output_codec in ["hevc", "av1"]:  # H.264 has limited HDR support
-            params.extend(self._get_hdr_params(encoder_type, input_path))
+        head = tuple(params)
+        params = []
         
         # Audio codec (copy without re-encoding)
         params.extend(["-c:a", "copy"])
@@ -355,7 +590,7 @@ class Config:
             params.extend(["-c:s", "copy"])   # Copy subtitle streams
             params.extend(["-map", "0"])      # Copy all streams
         
-        return params
+        return head, tuple(params)
     
     def _get_hevc_params(self, encoder_type: str, config: Dict, quality: Optional[int]) -> List[str]:
         """Get HEVC-specific encoding parameters."""
@@ -440,13 +675,14 @@ class Config:
         params.extend(["-cpu-used", str(config["cpu-used"])])
         return params
     
-    def _get_hdr_params(self, encoder_type: str, input_path: Optional[str]) -> List[str]:
+    def _get_hdr_params(self, encoder_type: str, input_path: Optional[str],
+                        video_info: Optional[Dict] = None) -> List[str]:
         """Get HDR preservation parameters."""
         params = []
         
         if encoder_type != "cpu" and input_path:
             # Hardware encoders: use detected HDR parameters
-            hdr_params = self._detect_hdr_params(input_path)
+            hdr_params = self._detect_hdr_params(input_path, video_info)
             
             # Special handling for NVENC
             if encoder_type == "nvidia" and hdr_params['color_trc'] == 'arib-std-b67':
@@ -3,16 +3,30 @@ Video converter module for multi-codec video conversion.
 Handles the actual conversion process with progress tracking.
 """
 
-import subprocess
+import asyncio
 import logging
-import re
+import queue
+import shlex
+import threading
 import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional, Callable, Dict, Any
-from dataclasses import dataclass
+from typing import Optional, Callable, Dict, Any, List
+from dataclasses import asdict, dataclass
 
-from config import Config, SUPPORTED_CODECS
-from utils import VideoUtils
+from config import Config, SUPPORTED_CODECS, DEFAULT_THREAD_QUEUE_SIZE
+from utils import VideoUtils, ProbeCache
+
+
+# FFmpeg error output (lowercased) that points at the encoder refusing its parameters,
+# at the HDR colour options in particular, or at the GPU running out of encode sessions
+_PARAM_REJECTION_ERRORS = ('invalid argument', 'error code: -22', 'invalid param')
+_HDR_OPTION_TERMS = ('color_primaries', 'color_trc', 'colorspace', 'color_range',
+                     'bt2020', 'smpte2084', 'arib-std-b67')
+_ERROR_TERMS = ('error', 'invalid', 'not supported', 'unsupported')
+_RESOURCE_ERRORS = ('out of memory', 'openencodesessionex', 'no capable devices',
+                    'device busy', 'resource temporarily unavailable')
 
 
 @dataclass
@@ -27,25 +41,55 @@ class ConversionProgress:
     percentage: float = 0.0
 
 
+@dataclass
+class FileResult:
+    """Outcome of one file in a batch conversion."""
+    input: str
+    output: str
+    status: str  # success, failed, error or skipped
+    reason: str = ""
+    error: str = ""
+    
+    def __getitem__(self, key: str) -> str:
+        """Allow result['status'] lookups, as when results were plain dictionaries."""
+        if key not in self.__dataclass_fields__:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def to_dict(self) -> Dict[str, str]:
+        """Return the result as the dictionary batch results used to hold."""
+        return asdict(self)
+
+
 class VideoConverter:
     """Handles video conversion between different codecs with progress tracking."""
     
-    def __init__(self, config: Optional[Config] = None):
+    def __init__(self, config: Optional[Config] = None, progress_interval: float = 0.0):
         """
         Initialize the video converter.
         
         Args:
             config: Configuration object (creates default if None)
+            progress_interval: Minimum seconds between progress callbacks unless the
+                whole percentage changes (0 reports every update)
         """
         self.config = config or Config()
         self.logger = logging.getLogger(__name__)
+        self.progress_interval = progress_interval
+        self.ffmpeg_threads = self.config.get_ffmpeg_threads()
         self._current_process = None
+        self._loop = None
+        self.probe_cache = ProbeCache()
+        self._cancelled = threading.Event()
+        # Last stderr lines of the most recent failed FFmpeg run
+        self._last_error_lines: List[str] = []
         
     def convert_video(self, input_path: Path, output_path: Path,
                      output_codec: str = "hevc",
                      quality: Optional[int] = None,
                      preserve_hdr: bool = True,
-                     progress_callback: Optional[Callable[[ConversionProgress], None]] = None) -> bool:
+                     progress_callback: Optional[Callable[[ConversionProgress], None]] = None,
+                     probe_cache: Optional[ProbeCache] = None) -> bool:
         """
         Convert a video to the specified codec.
         
@@ -56,6 +100,7 @@ class VideoConverter:
             quality: Quality setting override
             preserve_hdr: Whether to preserve HDR metadata
             progress_callback: Optional callback for progress updates
+            probe_cache: Optional cache to reuse ffprobe results from
             
         Returns:
             True if conversion successful, False otherwise
@@ -66,8 +111,11 @@ class VideoConverter:
                 self.logger.error(f"Input file not found: {input_path}")
                 return False
             
+            # Probe the input once; codec, duration and HDR checks all read from it
+            video_info = (probe_cache or self.probe_cache).get_info(input_path)
+            
             # Get input codec
-            input_codec = VideoUtils.get_video_codec(input_path)
+            input_codec = VideoUtils.get_video_codec(input_path, video_info) if video_info else None
             if not input_codec:
                 self.logger.error(f"Could not detect video codec: {input_path}")
                 return False
@@ -77,10 +125,13 @@ class VideoConverter:
                 self.logger.warning(f"Input and output codecs are the same: {input_codec}")
                 # Could still proceed if user wants to re-encode with different settings
             
-            # Get video info for duration calculation
-            video_info = VideoUtils.get_video_info(input_path)
+            # Get duration for progress calculation
             duration = self._get_duration(video_info)
             
+            # HDR only matters for codecs we carry HDR metadata into
+            has_hdr = (preserve_hdr and output_codec in ["hevc", "av1"] and
+                       VideoUtils.has_hdr_metadata(input_path, video_info))
+            
             # Log conversion start
             file_size = VideoUtils.get_file_size_mb(input_path)
             input_codec_name = VideoUtils.get_codec_display_name(input_codec)
@@ -88,7 +139,6 @@ class VideoConverter:
             
             hdr_status = ""
             if preserve_hdr and output_codec in ["hevc", "av1"]:
-                has_hdr = VideoUtils.has_hdr_metadata(input_path)
                 hdr_status = " (preserving HDR)" if has_hdr else " (SDR)"
             
             self.logger.info(f"Converting {input_path.name} ({file_size:.1f} MB)")
@@ -98,37 +148,67 @@ class VideoConverter:
             encoder_type, encoder_config = self.config.get_encoder_config(output_codec)
             self.logger.info(f"Using {encoder_config['encoder']} encoder ({encoder_type})")
             
+            # Skip HDR parameters up front for encoders known to reject this HDR profile
+            use_hdr = preserve_hdr
+            hdr_profile = None
+            if encoder_type != "cpu" and preserve_hdr and output_codec in ["hevc", "av1"]:
+                hdr_profile = self.config.get_hdr_profile(str(input_path), video_info)
+                if self.config.is_hdr_blacklisted(encoder_config['encoder'], hdr_profile):
+                    self.logger.warning(f"{encoder_config['encoder']} is known to reject {hdr_profile} "
+                                        f"metadata, converting without HDR preservation")
+                    use_hdr = False
+            
             # Estimate conversion time
             estimated_time = VideoUtils.estimate_conversion_time(
                 file_size, encoder_type != "cpu"
             )
             self.logger.info(f"Estimated time: {estimated_time}")
             
+            # Decode on the GPU as well when the encoder runs there, unless it already failed on this codec
+            hwaccel = self.config.get_hwaccel_for(output_codec)
+            use_hwaccel = hwaccel is not None and not self.config.is_hwaccel_blacklisted(hwaccel[0], input_codec)
+            
             # Prepare FFmpeg command
             cmd = self._build_ffmpeg_command(input_path, output_path, output_codec, 
-                                           quality, preserve_hdr)
+                                           quality, use_hdr, video_info, use_hwaccel)
             
             # Start conversion
             success = self._run_conversion(cmd, duration, progress_callback)
             
-            # If conversion failed and we're using GPU with HDR, try fallback
-            if not success and encoder_type != "cpu" and preserve_hdr:
+            # The GPU may not be able to decode this source; retry with software decoding
+            if not success and use_hwaccel and not self._cancelled.is_set():
+                self.logger.warning(f"Conversion failed with {hwaccel[0]} decoding, retrying with software decoding...")
+                self._remove_partial_output(output_path)
+                use_hwaccel = False
+                cmd = self._build_ffmpeg_command(input_path, output_path, output_codec,
+                                                 quality, use_hdr, video_info, use_hwaccel)
+                success = self._run_conversion(cmd, duration, progress_callback)
+                
+                # Software decoding fixed it, so spare the rest of the batch the failing attempt
+                if success:
+                    self.config.add_hwaccel_blacklist(hwaccel[0], input_codec)
+            
+            # If conversion failed and we're using GPU with HDR on an HDR source, try fallback
+            # (HDR flags can't be the cause for SDR inputs, so retrying would just repeat the failure)
+            if (not success and encoder_type != "cpu" and use_hdr and has_hdr
+                    and not self._cancelled.is_set()):
                 self.logger.warning("Conversion failed with HDR parameters, trying fallback without HDR...")
+                hdr_rejected = self._hdr_options_rejected(self._last_error_lines)
                 
                 # Clean up failed output file
-                if output_path.exists():
-                    try:
-                        output_path.unlink()
-                    except OSError:
-                        pass
+                self._remove_partial_output(output_path)
                 
                 # Retry without HDR preservation
                 cmd_fallback = self._build_ffmpeg_command(input_path, output_path, output_codec,
-                                                         quality, False)
+                                                         quality, False, video_info, use_hwaccel)
                 success = self._run_conversion(cmd_fallback, duration, progress_callback)
                 
                 if success:
                     self.logger.info("Conversion succeeded with fallback (no HDR preservation)")
+                    # Only remember the encoder as HDR-incapable when FFmpeg said so; other
+                    # failures (e.g. too many GPU encode sessions) may just have been transient
+                    if hdr_profile and hdr_rejected:
+                        self.config.add_hdr_blacklist(encoder_config['encoder'], hdr_profile)
                 else:
                     self.logger.error("Conversion failed even with fallback")
             
@@ -141,11 +221,7 @@ class VideoConverter:
             else:
                 self.logger.error(f"Conversion failed: {input_path.name}")
                 # Clean up failed output file
-                if output_path.exists():
-                    try:
-                        output_path.unlink()
-                    except OSError:
-                        pass
+                self._remove_partial_output(output_path)
             
             return success
             
@@ -153,18 +229,59 @@ class VideoConverter:
             self.logger.error(f"Unexpected error converting {input_path}: {e}")
             return False
     
+    @staticmethod
+    def _hdr_options_rejected(error_lines: List[str]) -> bool:
+        """Tell from FFmpeg's error output whether the encoder rejected the HDR options."""
+        lines = [line.lower() for line in error_lines]
+        if any(term in line for line in lines for term in _RESOURCE_ERRORS):
+            return False
+        for line in lines:
+            if any(term in line for term in _PARAM_REJECTION_ERRORS):
+                return True
+            if any(term in line for term in _ERROR_TERMS) and any(term in line for term in _HDR_OPTION_TERMS):
+                return True
+        return False
+    
+    def _remove_partial_output(self, output_path: Path) -> None:
+        """Delete the output left behind by a failed FFmpeg run."""
+        if output_path.exists():
+            try:
+                output_path.unlink()
+            except OSError:
+                pass
+    
     def _build_ffmpeg_command(self, input_path: Path, output_path: Path,
                              output_codec: str, quality: Optional[int], 
-                             preserve_hdr: bool) -> list:
+                             preserve_hdr: bool, video_info: Optional[Dict] = None,
+                             use_hwaccel: bool = False) -> list:
         """Build the FFmpeg command for conversion."""
         cmd = ['ffmpeg', '-y']  # -y to overwrite output files
         
-        # Input file
-        cmd.extend(['-i', str(input_path)])
+        # Machine-readable progress on stdout instead of scraping the stderr stats line
+        cmd.extend(['-progress', 'pipe:1', '-nostats'])
+        
+        # Hardware decoding, keeping frames on the GPU when the encoder can take them directly
+        if use_hwaccel:
+            hwaccel = self.config.get_hwaccel_for(output_codec)
+            if hwaccel:
+                hwaccel_method, hwaccel_format = hwaccel
+                cmd.extend(['-hwaccel', hwaccel_method])
+                if hwaccel_format:
+                    cmd.extend(['-hwaccel_output_format', hwaccel_format])
+        
+        # Input file, with a deeper demuxer queue so high-bitrate sources don't stall the encoder
+        cmd.extend(['-thread_queue_size', str(self.config.thread_queue_size or DEFAULT_THREAD_QUEUE_SIZE),
+                    '-i', str(input_path)])
+        
+        # Cap encoder threads so parallel CPU encodes share the cores instead of fighting over them
+        if self.ffmpeg_threads:
+            encoder_type, _ = self.config.get_encoder_config(output_codec)
+            if encoder_type == "cpu":
+                cmd.extend(['-threads', str(self.ffmpeg_threads)])
         
         # Get conversion parameters from config
         params = self.config.get_conversion_params(
-            output_codec, preserve_hdr, quality, str(input_path)
+            output_codec, preserve_hdr, quality, str(input_path), video_info=video_info
         )
         cmd.extend(params)
         
@@ -186,132 +303,130 @@ class VideoConverter:
         Returns:
             True if successful, False otherwise
         """
+        self._last_error_lines = []
+        
+        # Cancelled before FFmpeg started (e.g. while probing); don't start it at all
+        if self._cancelled.is_set():
+            self.logger.info("Conversion cancelled before FFmpeg started")
+            return False
+        return asyncio.run(self._run_conversion_async(cmd, duration, progress_callback))
+    
+    async def _run_conversion_async(self, cmd: list, duration: Optional[float],
+                                    progress_callback: Optional[Callable[[ConversionProgress], None]]) -> bool:
+        """Coroutine driving the FFmpeg process for _run_conversion."""
         process = None
         try:
-            # Log the FFmpeg command for debugging
-            cmd_str = ' '.join(f'"{arg}"' if ' ' in arg else arg for arg in cmd)
-            self.logger.info(f"Running FFmpeg command: {cmd_str}")
+            # Log the FFmpeg command for debugging (only build the string if it will be emitted)
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("Running FFmpeg command: %s", shlex.join(cmd))
             
             # Start FFmpeg process
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                universal_newlines=True,
-                bufsize=0
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
             )
             
             # Store process reference for cancellation
+            self._loop = asyncio.get_running_loop()
             self._current_process = process
             
+            # A cancel that arrived while the process was starting had nothing to terminate
+            if self._cancelled.is_set():
+                process.terminate()
+            
             progress = ConversionProgress()
             start_time = time.time()
             last_output_time = start_time
+            last_progress_log = 0.0
+            last_callback_time = 0.0
+            last_callback_percent = -1
+            log_progress = self.logger.isEnabledFor(logging.INFO)
+            
+            # Keep only the last few stderr lines for error reporting
+            stderr_tail = deque(maxlen=20)
+            
+            async def drain_stderr():
+                async for raw_line in process.stderr:
+                    line = raw_line.decode('utf-8', errors='replace').strip()
+                    if line:
+                        stderr_tail.append(line)
+                        self.logger.debug(f"FFmpeg stderr: {line}")
+            
+            # Stderr must keep draining so FFmpeg never blocks on a full pipe
+            stderr_task = asyncio.ensure_future(drain_stderr())
             
             # Monitor progress with timeout handling
             while True:
                 try:
-                    # Check if process is still running
-                    if process.poll() is not None:
-                        break
-                    
                     # Read output with timeout
-                    import sys
+                    try:
+                        raw_line = await asyncio.wait_for(process.stdout.readline(), timeout=1.0)
+                    except asyncio.TimeoutError:
+                        raw_line = None
                     
-                    if sys.platform != 'win32':
-                        # Unix-like systems: use select
-                        import select
-                        ready, _, _ = select.select([process.stderr], [], [], 1.0)
-                        if ready:
-                            output = process.stderr.readline()
-                        else:
-                            output = ''
-                    else:
-                        # Windows: use non-blocking read with threading
-                        import threading
-                        import queue as thread_queue
-                        
-                        def read_output(process, q):
-                            try:
-                                line = process.stderr.readline()
-                                q.put(line)
-                            except:
-                                q.put('')
-                        
-                        q = thread_queue.Queue()
-                        t = threading.Thread(target=read_output, args=(process, q))
-                        t.daemon = True
-                        t.start()
-                        
-                        try:
-                            output = q.get(timeout=1.0)
-                        except thread_queue.Empty:
-                            output = ''
+                    # End of output means the process has finished
+                    if raw_line == b'':
+                        break
                     
                     current_time = time.time()
                     
-                    if output:
+                    if raw_line:
                         last_output_time = current_time
-                        line = output.strip()
-                        if line:
-                            self.logger.debug(f"FFmpeg stderr: {line}")
-                            # Only parse lines that look like progress updates
-                            if 'frame=' in line and 'time=' in line:
-                                self._parse_progress(line, progress, duration)
-                                
-                                # Call progress callback if provided
-                                if progress_callback:
-                                    progress_callback(progress)
-                                    
-                                self.logger.info(f"Progress: {progress.percentage:.1f}% - Frame {progress.frame} - {progress.fps:.1f} fps")
+                        # Each "progress=" line closes a block of key=value updates
+                        if self._parse_progress(raw_line.decode('utf-8', errors='replace'), progress, duration):
+                            # Call progress callback if provided, skipping updates the caller asked not to see
+                            percent = int(progress.percentage)
+                            if progress_callback and (current_time - last_callback_time >= self.progress_interval or
+                                                      percent != last_callback_percent or
+                                                      raw_line.startswith(b'progress=end')):
+                                last_callback_time = current_time
+                                last_callback_percent = percent
+                                progress_callback(progress)
+                            
+                            # Log at most twice a second; fast encoders report far more often
+                            if log_progress and current_time - last_progress_log >= 0.5:
+                                last_progress_log = current_time
+                                self.logger.info("Progress: %.1f%% - Frame %d - %.1f fps",
+                                                 progress.percentage, progress.frame, progress.fps)
                     
                     # Check for timeout (no output for 30 seconds)
                     if current_time - last_output_time > 30:
                         self.logger.warning("FFmpeg process seems to be hanging (no output for 30s)")
                         break
                     
-                    # Small delay to prevent excessive CPU usage
-                    time.sleep(0.1)
-                    
                 except Exception as e:
                     self.logger.error(f"Error reading FFmpeg output: {e}")
                     break
             
             # Wait for process to complete with timeout
             try:
-                return_code = process.wait(timeout=10)
-            except subprocess.TimeoutExpired:
+                return_code = await asyncio.wait_for(process.wait(), timeout=10)
+            except asyncio.TimeoutError:
                 self.logger.error("FFmpeg process did not exit gracefully, terminating")
                 process.terminate()
                 try:
-                    return_code = process.wait(timeout=5)
-                except subprocess.TimeoutExpired:
+                    return_code = await asyncio.wait_for(process.wait(), timeout=5)
+                except asyncio.TimeoutError:
                     process.kill()
-                    return_code = process.wait()
+                    return_code = await process.wait()
             
-            # Read any remaining stderr output
-            stderr_output = ""
+            # Let the stderr drain reach end of output so the tail is complete
             try:
-                # Since we've been reading from stderr, there might not be much left
-                remaining_output = process.stderr.read()
-                if remaining_output:
-                    stderr_output = remaining_output
-            except:
+                await asyncio.wait_for(stderr_task, timeout=5)
+            except (asyncio.TimeoutError, OSError, ValueError):
                 pass
             
             if return_code != 0:
                 self.logger.error(f"FFmpeg failed with return code {return_code}")
+                self._last_error_lines = list(stderr_tail)
                 
-                # Check for specific error patterns
+                # Log error output and check for specific issues
                 invalid_arg_error = False
-                if stderr_output:
-                    # Log error output and check for specific issues
-                    error_lines = stderr_output.strip().split('\n')[-10:]  # Show more lines for debugging
-                    for line in error_lines:
-                        if line.strip():
-                            self.logger.error(f"FFmpeg: {line}")
-                            if "Invalid argument" in line or "error code: -22" in line:
-                                invalid_arg_error = True
+                for line in stderr_tail:
+                    self.logger.error(f"FFmpeg: {line}")
+                    if "Invalid argument" in line or "error code: -22" in line:
+                        invalid_arg_error = True
                 
                 if invalid_arg_error:
                     self.logger.error("Detected 'Invalid argument' error - likely HDR parameter incompatibility with GPU encoder")
@@ -330,85 +445,69 @@ class VideoConverter:
         finally:
             # Clean up process reference
             self._current_process = None
-            if process:
+            self._loop = None
+            if process and process.returncode is None:
                 try:
-                    if process.poll() is None:
-                        process.terminate()
-                        try:
-                            process.wait(timeout=5)
-                        except subprocess.TimeoutExpired:
-                            process.kill()
-                            process.wait()
-                except:
+                    process.terminate()
+                    try:
+                        await asyncio.wait_for(process.wait(), timeout=5)
+                    except asyncio.TimeoutError:
+                        process.kill()
+                        await process.wait()
+                except ProcessLookupError:
                     pass
     
+    
     def _parse_progress(self, line: str, progress: ConversionProgress, 
-                       duration: Optional[float]) -> None:
-        """Parse FFmpeg stderr output and update progress object."""
+                       duration: Optional[float]) -> bool:
+        """
+        Parse one line of FFmpeg -progress output and update the progress object.
+        
+        Returns:
+            True when the line ends a progress block (progress=continue/end)
+        """
+        # Format: one "key=value" per line, e.g. frame=1234, out_time_us=49360000, speed=1.02x
+        key, _, value = line.strip().partition('=')
+        value = value.strip()
+        
         try:
-            # Look for progress lines that contain frame, fps, time, etc.
-            # Format: frame= 1234 fps= 25 q=28.0 size=    1024kB time=00:00:49.36 bitrate= 170.1kbits/s speed=1.0x
-            if 'frame=' in line and 'time=' in line:
-                import re
-                
-                # Extract frame number
-                frame_match = re.search(r'frame=\s*(\d+)', line)
-                if frame_match:
-                    progress.frame = int(frame_match.group(1))
-                
-                # Extract fps
-                fps_match = re.search(r'fps=\s*([\d.]+)', line)
-                if fps_match:
-                    progress.fps = float(fps_match.group(1))
-                
-                # Extract bitrate
-                bitrate_match = re.search(r'bitrate=\s*([\d.]+\w*bits/s)', line)
-                if bitrate_match:
-                    progress.bitrate = bitrate_match.group(1)
-                
-                # Extract size
-                size_match = re.search(r'size=\s*([\d.]+\w*B)', line)
-                if size_match:
-                    progress.size = size_match.group(1)
-                
-                # Extract time and calculate percentage
-                time_match = re.search(r'time=(\d{2}):(\d{2}):(\d{2})\.(\d{2})', line)
-                if time_match:
-                    hours = int(time_match.group(1))
-                    minutes = int(time_match.group(2))
-                    seconds = int(time_match.group(3))
-                    centiseconds = int(time_match.group(4))
-                    
-                    total_seconds = hours * 3600 + minutes * 60 + seconds + centiseconds / 100
-                    progress.time = self._format_time(total_seconds)
-                    
-                    # Calculate percentage if we have duration
-                    if duration and duration > 0:
-                        progress.percentage = min((total_seconds / duration) * 100, 100)
+            if key == 'frame':
+                progress.frame = int(value)
+            elif key == 'fps':
+                progress.fps = float(value)
+            elif key == 'bitrate':
+                if value.endswith('bits/s'):
+                    progress.bitrate = value
+            elif key == 'total_size':
+                progress.size = f"{int(value) // 1024}kB"
+            elif key == 'out_time_us':
+                total_seconds = max(int(value), 0) / 1_000_000
+                progress.time = self._format_time(total_seconds)
                 
-                # Extract speed
-                speed_match = re.search(r'speed=\s*([\d.]+x)', line)
-                if speed_match:
-                    progress.speed = speed_match.group(1)
-        
-        except (ValueError, IndexError, AttributeError):
-            # Ignore parsing errors
+                # Calculate percentage if we have duration
+                if duration and duration > 0:
+                    progress.percentage = min((total_seconds / duration) * 100, 100)
+            elif key == 'speed':
+                if value.endswith('x'):
+                    progress.speed = value
+            elif key == 'progress':
+                return True
+        except ValueError:
+            # Ignore N/A and other unparsable values
             pass
+        
+        return False
     
     def _get_duration(self, video_info: Optional[Dict]) -> Optional[float]:
         """Extract video duration from video info."""
         if not video_info:
             return None
         
-        # Try to get duration from format
-        format_info = video_info.get('format', {})
-        duration_str = format_info.get('duration')
-        
-        if duration_str:
-            try:
-                return float(duration_str)
-            except ValueError:
-                pass
+        # The container duration is almost always present; only scan streams without it
+        try:
+            return float(video_info['format']['duration'])
+        except (KeyError, TypeError, ValueError):
+            pass
         
         # Try to get duration from video stream
         for stream in video_info.get('streams', []):
@@ -432,44 +531,74 @@ class VideoConverter:
     
     def cancel_conversion(self):
         """Cancel the currently running conversion."""
-        if self._current_process:
+        # Stop convert_video from starting its fallback retries once this run ends
+        self._cancelled.set()
+        loop = self._loop
+        if self._current_process and loop:
             try:
                 self.logger.info("Cancelling conversion...")
-                self._current_process.terminate()
-                try:
-                    self._current_process.wait(timeout=5)
-                except subprocess.TimeoutExpired:
-                    self.logger.warning("Process did not terminate gracefully, killing...")
-                    self._current_process.kill()
-                    self._current_process.wait()
+                # The process belongs to the conversion's event loop, which may run in another thread
+                loop.call_soon_threadsafe(self._terminate_current_process)
                 return True
             except Exception as e:
                 self.logger.error(f"Error cancelling conversion: {e}")
                 return False
         return False
+    
+    def reset_cancel(self):
+        """Clear a previous cancel so the converter can run another conversion."""
+        self._cancelled.clear()
+    
+    def _terminate_current_process(self):
+        """Terminate the running FFmpeg process; must run on the conversion's event loop."""
+        process = self._current_process
+        if process and process.returncode is None:
+            try:
+                process.terminate()
+            except ProcessLookupError:
+                pass
 
 
 class BatchConverter:
     """Handles batch conversion of multiple videos."""
     
-    def __init__(self, config: Optional[Config] = None):
+    def __init__(self, config: Optional[Config] = None, progress_interval: float = 0.0,
+                 probe_cache: Optional[ProbeCache] = None):
         """
         Initialize the batch converter.
         
         Args:
             config: Configuration object (creates default if None)
+            progress_interval: Minimum seconds between progress callbacks per file
+                (see VideoConverter)
+            probe_cache: Cache to reuse ffprobe results from (creates a new one if None)
         """
-        self.converter = VideoConverter(config)
+        self.config = config or Config()
+        self._progress_interval = progress_interval
+        # One converter per concurrent encode, handed out to workers from an idle queue
+        self._converters = [VideoConverter(self.config, progress_interval)
+                            for _ in range(self.config.max_parallel)]
+        self._idle_converters: queue.Queue = queue.Queue()
+        for converter in self._converters:
+            self._idle_converters.put(converter)
+        self.converter = self._converters[0]
+        self.probe_cache = probe_cache or ProbeCache()
         self.logger = logging.getLogger(__name__)
-        self._cancelled = False
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._pending_futures: List[Future] = []
     
     def convert_directory(self, input_dir: Path, output_dir: Optional[Path] = None,
                          input_codec: Optional[str] = None, output_codec: str = "hevc",
                          quality: Optional[int] = None, preserve_hdr: bool = True,
-                         progress_callback: Optional[Callable[[str, int, int, ConversionProgress], None]] = None) -> Dict[str, Any]:
+                         progress_callback: Optional[Callable[[str, int, int, ConversionProgress], None]] = None,
+                         video_files: Optional[List[Path]] = None,
+                         max_parallel: Optional[int] = None) -> Dict[str, Any]:
         """
         Convert videos in a directory to the specified codec.
         
+        Up to max_parallel (default config.max_parallel) videos are converted concurrently.
+        
         Args:
             input_dir: Directory containing videos
             output_dir: Output directory (defaults to same as input)
@@ -477,10 +606,15 @@ class BatchConverter:
             output_codec: Target codec (hevc, h264, av1, vp9)
             quality: Quality setting override
             preserve_hdr: Whether to preserve HDR metadata
-            progress_callback: Optional callback for progress updates (filename, current, total, progress)
+            progress_callback: Optional callback for progress updates (filename, completed, total, progress),
+                where completed is the number of files finished so far. Called once more with 100%
+                as each file finishes. May be called from several worker threads at once.
+            video_files: Videos already found in input_dir (skips scanning the directory again)
+            max_parallel: Override for the number of concurrent conversions
             
         Returns:
-            Dictionary with conversion results
+            Dictionary with conversion results (files is a list of FileResult in directory order;
+            they also support result['status'] style lookups and to_dict())
         """
         results = {
             'total': 0,
@@ -491,10 +625,14 @@ class BatchConverter:
         }
         
         # Reset cancellation flag
-        self._cancelled = False
+        self._cancelled.clear()
         
-        # Find videos to convert
-        videos = VideoUtils.find_videos_by_codec(input_dir, input_codec)
+        # Find videos to convert, probing all candidates concurrently
+        candidates = video_files if video_files is not None else VideoUtils.find_video_files(input_dir)
+        video_codecs = {path: VideoUtils.get_video_codec(path, info or {})
+                        for path, info in self.probe_cache.prefetch(candidates).items()}
+        videos = [path for path in candidates
+                  if not input_codec or video_codecs[path] == input_codec]
         results['total'] = len(videos)
         
         if not videos:
@@ -507,74 +645,153 @@ class BatchConverter:
         
         self.logger.info(f"Found {len(videos)} video(s) to convert")
         
-        # Convert each video
+        # One slot per video, filled by index so results keep the directory order
+        files: List[Optional[FileResult]] = [None] * len(videos)
+        
+        # Create the output directory once rather than once per video
+        if output_dir is not None:
+            output_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Decide which videos need converting; outputs claimed by an earlier job count as existing
+        jobs = []
+        claimed_outputs = set()
         for i, input_path in enumerate(videos, 1):
             # Check for cancellation
-            if self._cancelled:
+            if self._cancelled.is_set():
                 self.logger.info("Batch conversion cancelled by user")
                 break
-                
+            
+            output_path = None
             try:
                 # Skip if input and output codecs are the same
-                video_codec = VideoUtils.get_video_codec(input_path)
+                video_codec = video_codecs[input_path]
                 if video_codec == output_codec:
                     self.logger.info(f"Skipping {input_path.name} - already in {output_codec} format")
                     results['skipped'] += 1
-                    results['files'].append({
-                        'input': str(input_path),
-                        'output': '',
-                        'status': 'skipped',
-                        'reason': 'same_codec'
-                    })
+                    files[i - 1] = FileResult(str(input_path), '', 'skipped', reason='same_codec')
                     continue
                 
                 # Generate output path
-                output_path = VideoUtils.generate_output_path(input_path, output_dir, output_codec)
+                output_path = (output_dir or input_path.parent) / VideoUtils.generate_output_name(
+                    input_path, output_codec, input_codec=video_codec
+                )
                 
-                # Skip if output already exists
-                if output_path.exists():
+                # Skip if output already exists (or another input in this batch maps to it)
+                if output_path in claimed_outputs or output_path.exists():
                     self.logger.info(f"Skipping {input_path.name} - output exists")
                     results['skipped'] += 1
-                    results['files'].append({
-                        'input': str(input_path),
-                        'output': str(output_path),
-                        'status': 'skipped',
-                        'reason': 'exists'
-                    })
+                    files[i - 1] = FileResult(str(input_path), str(output_path), 'skipped', reason='exists')
                     continue
                 
-                # Create progress callback for this file
-                def file_progress_callback(progress: ConversionProgress):
-                    if progress_callback:
-                        progress_callback(input_path.name, i, len(videos), progress)
-                
-                # Convert the video
-                success = self.converter.convert_video(
-                    input_path, output_path, output_codec, quality, preserve_hdr, file_progress_callback
-                )
-                
-                if success:
-                    results['successful'] += 1
-                    status = 'success'
-                else:
-                    results['failed'] += 1
-                    status = 'failed'
-                
-                results['files'].append({
-                    'input': str(input_path),
-                    'output': str(output_path),
-                    'status': status
-                })
+                claimed_outputs.add(output_path)
+                jobs.append((i, input_path, output_path))
                 
             except Exception as e:
                 self.logger.error(f"Error processing {input_path}: {e}")
                 results['failed'] += 1
-                results['files'].append({
-                    'input': str(input_path),
-                    'output': str(output_path) if 'output_path' in locals() else 'unknown',
-                    'status': 'error',
-                    'error': str(e)
-                })
+                files[i - 1] = FileResult(str(input_path), str(output_path) if output_path else 'unknown',
+                                          'error', error=str(e))
+        
+        max_workers = max(1, min(max_parallel or self.config.max_parallel, len(jobs)))
+        self._ensure_converters(max_workers)
+        
+        # Parallel encodes thrash spinning disks with seeks, so cap how many touch them at once
+        disk_concurrency = self.config.disk_concurrency
+        if disk_concurrency is None:
+            disk_concurrency = max_workers
+            if max_workers > 1:
+                dirs = [input_dir] + ([output_dir] if output_dir and output_dir.exists() else [])
+                if any(VideoUtils.is_rotational_disk(d) for d in dirs):
+                    self.logger.info("Spinning disk detected, converting one video at a time")
+                    disk_concurrency = 1
+        disk_concurrency = max(1, min(disk_concurrency, max_workers))
+        disk_slots = threading.Semaphore(disk_concurrency)
+        
+        # Split the cores between the encodes that can actually run at the same time
+        ffmpeg_threads = self.config.get_ffmpeg_threads(disk_concurrency)
+        
+        # Files finished so far, skipped ones included. Reported as the batch position instead
+        # of each file's index, which would jump back and forth with several files converting
+        completed = len(videos) - len(jobs)
+        
+        def convert_job(index: int, input_path: Path, output_path: Path) -> Optional[bool]:
+            # Create progress callback for this file
+            def file_progress_callback(progress: ConversionProgress):
+                if progress_callback:
+                    progress_callback(input_path.name, completed, len(videos), progress)
+            
+            with disk_slots:
+                # Cancelled while waiting for the disk; treat like a job that never started
+                if self._cancelled.is_set():
+                    return None
+                
+                # Borrow an idle converter so each running FFmpeg process has its own owner
+                converter = self._idle_converters.get()
+                try:
+                    # cancel_conversion marks converters under the same lock, so a cancel either
+                    # shows up in the batch flag here or reaches the converter after the reset
+                    with self._lock:
+                        converter.reset_cancel()
+                        if self._cancelled.is_set():
+                            return None
+                    converter.ffmpeg_threads = ffmpeg_threads
+                    return converter.convert_video(
+                        input_path, output_path, output_codec, quality, preserve_hdr, file_progress_callback,
+                        self.probe_cache
+                    )
+                finally:
+                    self._idle_converters.put(converter)
+        
+        # Convert videos concurrently
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {}
+            with self._lock:
+                for job in jobs:
+                    if self._cancelled.is_set():
+                        break
+                    futures[executor.submit(convert_job, *job)] = job
+                self._pending_futures = list(futures)
+            
+            for future in as_completed(futures):
+                index, input_path, output_path = futures[future]
+                if future.cancelled():
+                    continue
+                
+                try:
+                    success = future.result()
+                    if success is None:
+                        continue
+                    
+                    if success:
+                        results['successful'] += 1
+                        status = 'success'
+                    else:
+                        results['failed'] += 1
+                        status = 'failed'
+                    
+                    files[index - 1] = FileResult(str(input_path), str(output_path), status)
+                    
+                except Exception as e:
+                    self.logger.error(f"Error processing {input_path}: {e}")
+                    results['failed'] += 1
+                    files[index - 1] = FileResult(str(input_path), str(output_path), 'error', error=str(e))
+                
+                completed += 1
+                if progress_callback:
+                    try:
+                        progress_callback(input_path.name, completed, len(videos), ConversionProgress(percentage=100.0))
+                    except InterruptedError:
+                        # The caller's way of cancelling from inside a callback
+                        self.cancel_conversion()
+        
+        with self._lock:
+            self._pending_futures = []
+        
+        # Videos never reached because of cancellation have no result
+        results['files'] = [result for result in files if result is not None]
+        
+        if self._cancelled.is_set():
+            self.logger.info("Batch conversion cancelled by user")
         
         # Log summary
         self.logger.info(f"Batch conversion completed:")
@@ -585,7 +802,22 @@ class BatchConverter:
         
         return results
     
+    def _ensure_converters(self, count: int) -> None:
+        """Grow the converter pool so that count conversions can run at once."""
+        with self._lock:
+            while len(self._converters) < count:
+                converter = VideoConverter(self.config, self._progress_interval)
+                self._converters.append(converter)
+                self._idle_converters.put(converter)
+    
     def cancel_conversion(self):
         """Cancel the batch conversion."""
-        self._cancelled = True
-        return self.converter.cancel_conversion() 
\ No newline at end of file
+        self._cancelled.set()
+        with self._lock:
+            for future in self._pending_futures:
+                future.cancel()
+        
+            cancelled = False
+            for converter in self._converters:
+                cancelled = converter.cancel_conversion() or cancelled
+        return cancelled
\ No newline at end of file
@@ -10,16 +10,16 @@ try:
     
     # Create a 256x256 image
     size = 256
-    img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
     
-    # Draw gradient background (blue to dark blue)
-    for y in range(size):
-        # Gradient from light blue to dark blue
-        r = 0
-        g = int(100 - (y / size * 50))
-        b = int(255 - (y / size * 100))
-        draw.rectangle([0, y, size, y+1], fill=(r, g, b, 255))
+    # Draw gradient background (blue to dark blue) as a one pixel wide
+    # column stretched across the image, instead of one rectangle per row
+    gradient = Image.new('RGBA', (1, size))
+    gradient.putdata([
+        (0, int(100 - (y / size * 50)), int(255 - (y / size * 100)), 255)
+        for y in range(size)
+    ])
+    img = gradient.resize((size, size), Image.NEAREST)
+    draw = ImageDraw.Draw(img)
     
     # Draw a rounded rectangle border
     padding = 20
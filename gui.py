@@ -7,18 +7,57 @@ with real-time progress tracking, batch processing, and system information.
 """
 
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, scrolledtext
+from tkinter import ttk, filedialog, messagebox
+import os
+import stat
 import threading
 import queue
 import time
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from bisect import bisect_left
+from collections import deque
+from itertools import islice
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable
 import logging
 
-from config import Config, SUPPORTED_CODECS
+from config import Config, SUPPORTED_CODECS, CODEC_EXTENSIONS
 from converter import VideoConverter, BatchConverter, ConversionProgress
-from utils import VideoUtils, setup_logging
+from utils import VideoUtils, ProbeCache, setup_logging
+
+# Display name -> codec key lookups for the codec combo boxes
+_INPUT_NAME_TO_KEY = {info["name"]: key for key, info in SUPPORTED_CODECS["input"].items()}
+_OUTPUT_NAME_TO_KEY = {info["name"]: key for key, info in SUPPORTED_CODECS["output"].items()}
+
+# Output codecs that can carry HDR metadata
+_HDR_CODECS = frozenset({"hevc", "av1"})
+
+# Quality slider descriptions: upper bound of each band, and the labels for
+# those bands plus everything above the last bound
+_QUALITY_LABELS = ["Very High Quality", "High Quality", "Medium Quality", "Lower Quality", "Very Low Quality"]
+_QUALITY_BOUNDS = {
+    "av1": [20, 30, 40, 50],  # AV1/VP9 use a 0-63 scale
+    "vp9": [20, 30, 40, 50],
+}
+_DEFAULT_QUALITY_BOUNDS = [18, 23, 28, 35]  # HEVC/H.264 CRF scale
+
+# Extensions accepted as-is on a user-supplied output filename
+_OUTPUT_EXTENSIONS = frozenset(CODEC_EXTENSIONS.values())
+
+# Characters that mark an output entry as a path rather than a bare filename
+_PATH_SEPARATORS = frozenset('/\\:')
+
+# Videos listed individually in the batch file information and dry run
+_PREVIEW_FILES = 10
+
+
+def _stat_or_none(path: Path) -> Optional[os.stat_result]:
+    """Stat a path once, returning None if it does not exist or cannot be read."""
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
 
 
 class ToolTip:
@@ -32,28 +71,34 @@ class ToolTip:
         self.widget.bind('<Leave>', self.on_leave)
     
     def on_enter(self, event=None):
-        x, y, _, _ = self.widget.bbox("insert") if hasattr(self.widget, 'bbox') else (0, 0, 0, 0)
-        x += self.widget.winfo_rootx() + 25
-        y += self.widget.winfo_rooty() + 25
+        x = self.widget.winfo_rootx() + 25
+        y = self.widget.winfo_rooty() + 25
+        
+        # Build the tooltip window on first hover, then just show and hide it
+        if self.tooltip is None:
+            self.tooltip = tk.Toplevel(self.widget)
+            self.tooltip.wm_overrideredirect(True)
+            self.tooltip.withdraw()
+            
+            label = tk.Label(self.tooltip, text=self.text, 
+                            background="#ffffe0", relief="solid", borderwidth=1,
+                            font=("Arial", 9))
+            label.pack()
         
-        self.tooltip = tk.Toplevel(self.widget)
-        self.tooltip.wm_overrideredirect(True)
         self.tooltip.wm_geometry(f"+{x}+{y}")
-        
-        label = tk.Label(self.tooltip, text=self.text, 
-                        background="#ffffe0", relief="solid", borderwidth=1,
-                        font=("Arial", 9))
-        label.pack()
+        self.tooltip.deiconify()
     
     def on_leave(self, event=None):
         if self.tooltip:
-            self.tooltip.destroy()
-            self.tooltip = None
+            self.tooltip.withdraw()
 
 
 class ProgressWindow:
     """Dedicated window for showing conversion progress."""
     
+    # Lines kept in the statistics log; older lines are trimmed from the top
+    MAX_STATS_LINES = 2000
+    
     def __init__(self, parent, title="Converting Video"):
         self.window = tk.Toplevel(parent)
         self.window.title(title)
@@ -69,7 +114,16 @@ class ProgressWindow:
         ))
         
         self.cancelled = False
+        
+        # Updates are coalesced and applied to the widgets a few times per second
+        self._pending_lines = deque(maxlen=500)
+        self._latest_filename: Optional[str] = None
+        self._latest_file_progress: Optional[float] = None
+        self._latest_batch_progress: Optional[float] = None
+        self._timestamp = (0, "")
+        
         self.setup_ui()
+        self._flush_job = self.window.after(100, self._flush_updates)
     
     def setup_ui(self):
         """Set up the progress window UI."""
@@ -87,14 +141,16 @@ class ProgressWindow:
         self.file_progress.grid(row=1, column=1, sticky=(tk.W, tk.E), padx=(10, 0))
         
         ttk.Label(main_frame, text="Batch Progress:").grid(row=2, column=0, sticky=tk.W, pady=(10, 0))
-        self.batch_progress = ttk.Progressbar(main_frame, length=400, mode='determinate')
+        self.batch_progress = ttk.Progressbar(main_frame, length=400, mode='determinate', maximum=100)
         self.batch_progress.grid(row=2, column=1, sticky=(tk.W, tk.E), padx=(10, 0), pady=(10, 0))
         
         # Stats frame
         stats_frame = ttk.LabelFrame(main_frame, text="Conversion Statistics", padding="10")
         stats_frame.grid(row=3, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(20, 0))
         
-        self.stats_text = tk.Text(stats_frame, height=8, width=60, font=("Consolas", 9))
+        # Read-only log without an undo stack; only the flush enables it briefly to write
+        self.stats_text = tk.Text(stats_frame, height=8, width=60, font=("Consolas", 9),
+                                  undo=False, maxundo=0, state='disabled')
         scrollbar = ttk.Scrollbar(stats_frame, orient="vertical", command=self.stats_text.yview)
         self.stats_text.configure(yscrollcommand=scrollbar.set)
         
@@ -120,8 +176,8 @@ class ProgressWindow:
     
     def update_file_progress(self, filename: str, progress: ConversionProgress):
         """Update file conversion progress."""
-        self.file_label.config(text=f"Converting: {filename}")
-        self.file_progress['value'] = progress.percentage
+        self._latest_filename = filename
+        self._latest_file_progress = progress.percentage
         
         # Update stats
         stats = []
@@ -135,28 +191,70 @@ class ProgressWindow:
             stats.append(f"Bitrate: {progress.bitrate}")
         
         if stats:
-            stats_line = f"[{time.strftime('%H:%M:%S')}] " + " | ".join(stats) + "\n"
-            self.stats_text.insert(tk.END, stats_line)
-            self.stats_text.see(tk.END)
+            stats_line = f"[{self._time_str()}] {' | '.join(stats)}\n"
+            self._pending_lines.append(stats_line)
     
     def update_batch_progress(self, current: int, total: int):
         """Update batch progress."""
         if total > 0:
-            percentage = (current / total) * 100
-            self.batch_progress['value'] = percentage
-            self.batch_progress.configure(maximum=100)
+            self._latest_batch_progress = (current / total) * 100
     
     def add_log(self, message: str):
         """Add a log message to the stats area."""
-        log_line = f"[{time.strftime('%H:%M:%S')}] {message}\n"
-        self.stats_text.insert(tk.END, log_line)
-        self.stats_text.see(tk.END)
+        log_line = f"[{self._time_str()}] {message}\n"
+        self._pending_lines.append(log_line)
+    
+    def _time_str(self) -> str:
+        """Current time as HH:MM:SS, formatted at most once per second."""
+        now = int(time.time())
+        if now != self._timestamp[0]:
+            self._timestamp = (now, time.strftime('%H:%M:%S', time.localtime(now)))
+        return self._timestamp[1]
+    
+    def _flush_updates(self):
+        """Apply the latest queued progress and log lines to the widgets."""
+        if not self.window.winfo_exists():
+            return
+        
+        if self._latest_filename is not None:
+            self.file_label.config(text=f"Converting: {self._latest_filename}")
+            self._latest_filename = None
+        
+        if self._latest_file_progress is not None:
+            self.file_progress['value'] = self._latest_file_progress
+            self._latest_file_progress = None
+        
+        if self._latest_batch_progress is not None:
+            self.batch_progress['value'] = self._latest_batch_progress
+            self._latest_batch_progress = None
+        
+        if self._pending_lines:
+            # Only follow new output if the user hasn't scrolled up to read older lines
+            at_bottom = self.stats_text.yview()[1] > 0.999
+            self.stats_text.configure(state='normal')
+            self.stats_text.insert(tk.END, "".join(self._pending_lines))
+            self._pending_lines.clear()
+            
+            # Trim from the top so the Text widget never grows without bound
+            line_count = int(self.stats_text.index('end-1c').split('.')[0])
+            if line_count > self.MAX_STATS_LINES:
+                self.stats_text.delete('1.0', f'{line_count - self.MAX_STATS_LINES}.0')
+            self.stats_text.configure(state='disabled')
+            
+            if at_bottom:
+                self.stats_text.yview_moveto(1.0)
+        
+        self._flush_job = self.window.after(100, self._flush_updates)
     
     def conversion_completed(self, success: bool, message: str = ""):
         """Mark conversion as completed."""
         self.cancel_button.config(state="disabled")
         self.close_button.config(state="normal")
         
+        # Drop queued progress so it can't overwrite the final state
+        self._latest_filename = None
+        self._latest_file_progress = None
+        
         if success:
             self.file_label.config(text="✓ Conversion completed successfully!")
             self.add_log("Conversion completed successfully!")
@@ -174,16 +272,21 @@ class ProgressWindow:
     
     def close(self):
         """Close the progress window."""
+        self.window.after_cancel(self._flush_job)
         self.window.destroy()
 
 
 class VideoConverterGUI:
     """Main GUI application for multi-codec video converter."""
     
+    # Initial window size in pixels
+    WINDOW_WIDTH = 850
+    WINDOW_HEIGHT = 650
+    
     def __init__(self):
         self.root = tk.Tk()
         self.root.title("Multi-Codec Video Converter")
-        self.root.geometry("850x650")
+        self.root.geometry(f"{self.WINDOW_WIDTH}x{self.WINDOW_HEIGHT}")
         self.root.minsize(750, 550)
         
         # Initialize converter components
@@ -191,9 +294,20 @@ class VideoConverterGUI:
         self.converter = None
         self.batch_converter = None
         self.progress_window = None
-        
-        # Queue for thread communication
+        self._quality_after_id = None
+        self._file_info_after_id = None
+        # Shared by the file info panel, dry run and conversions so each file is probed once
+        self.probe_cache = ProbeCache()
+        # File information is probed on a worker; stale results are dropped by generation
+        self._info_pool = ThreadPoolExecutor(max_workers=1)
+        self._info_generation = 0
+        self._video_scan = None
+        
+        # Queue for thread communication. It is only polled while background work
+        # that reports through it is running (see track_background)
         self.message_queue = queue.Queue()
+        self._poll_after_id = None
+        self._background_tasks = []
         
         # Setup logging to capture messages
         self.setup_logging()
@@ -205,8 +319,8 @@ class VideoConverterGUI:
         self.setup_ui()
         self.setup_styles()
         
-        # Start message processing
-        self.process_messages()
+        # Deliver anything logged during startup
+        self.schedule_poll()
         
         # Center window
         self.center_window()
@@ -215,17 +329,22 @@ class VideoConverterGUI:
         """Setup logging to capture converter messages."""
         # Create a custom handler that sends messages to the queue
         class QueueHandler(logging.Handler):
-            def __init__(self, queue):
+            def __init__(self, queue, on_main_thread):
                 super().__init__()
                 self.queue = queue
+                self.on_main_thread = on_main_thread
             
             def emit(self, record):
-                self.queue.put(('log', self.format(record)))
+                # Formatting for display happens on the GUI thread, and only if the line is shown
+                self.queue.put(('log_record', record.levelno, record.getMessage()))
+                # Records from tracked workers are picked up by the running poll; only the
+                # GUI thread itself may schedule one
+                if threading.current_thread() is threading.main_thread():
+                    self.on_main_thread()
         
         # Setup logging
         logging.basicConfig(level=logging.INFO)
-        queue_handler = QueueHandler(self.message_queue)
-        queue_handler.setFormatter(logging.Formatter('%(levelname)s: %(message)s'))
+        queue_handler = QueueHandler(self.message_queue, self.schedule_poll)
         
         # Add to relevant loggers
         logging.getLogger('config').addHandler(queue_handler)
@@ -236,8 +355,10 @@ class VideoConverterGUI:
         """Initialize converter components."""
         try:
             self.config = Config()
-            self.converter = VideoConverter(self.config)
-            self.batch_converter = BatchConverter(self.config)
+            # The progress window redraws every 100 ms, so finer updates would only queue up
+            self.converter = VideoConverter(self.config, progress_interval=0.1)
+            self.batch_converter = BatchConverter(self.config, progress_interval=0.1,
+                                                  probe_cache=self.probe_cache)
         except Exception as e:
             messagebox.showerror("Initialization Error", 
                                f"Failed to initialize converter: {e}")
@@ -254,9 +375,15 @@ class VideoConverterGUI:
     
     def setup_ui(self):
         """Setup the main user interface."""
+        # Options read during conversion exist even before the Settings tab is built
+        self.verbose_logging = tk.BooleanVar(value=False)
+        self.auto_detect_hdr = tk.BooleanVar(value=True)
+        self.max_parallel = tk.IntVar(value=self.config.max_parallel if self.config else 1)
+        
         # Create notebook for tabs
         notebook = ttk.Notebook(self.root)
         notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.notebook = notebook
         
         # Main conversion tab
         self.main_frame = ttk.Frame(notebook)
@@ -266,12 +393,17 @@ class VideoConverterGUI:
         # Settings tab
         self.settings_frame = ttk.Frame(notebook)
         notebook.add(self.settings_frame, text="Settings")
-        self.setup_settings_tab()
         
         # System info tab
         self.info_frame = ttk.Frame(notebook)
         notebook.add(self.info_frame, text="System Info")
-        self.setup_info_tab()
+        
+        # Settings and System Info are built the first time they're shown
+        self._tab_builders = {
+            str(self.settings_frame): self.setup_settings_tab,
+            str(self.info_frame): self.setup_info_tab,
+        }
+        notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
         
         # Status bar
         self.setup_status_bar()
@@ -301,8 +433,7 @@ class VideoConverterGUI:
         
         ttk.Label(self.filter_frame, text="Filter by codec:").pack(side=tk.LEFT)
         self.input_codec_filter = tk.StringVar(value="all")
-        codec_values = ["all"] + list(SUPPORTED_CODECS["input"].keys())
-        codec_names = ["All codecs"] + [SUPPORTED_CODECS["input"][c]["name"] for c in codec_values[1:]]
+        codec_names = ["All codecs"] + [info["name"] for info in SUPPORTED_CODECS["input"].values()]
         
         self.codec_filter_combo = ttk.Combobox(self.filter_frame, textvariable=self.input_codec_filter,
                                               values=codec_names, state="readonly", width=20)
@@ -320,6 +451,7 @@ class VideoConverterGUI:
         self.input_path = tk.StringVar()
         self.input_entry = ttk.Entry(input_path_frame, textvariable=self.input_path, width=50)
         self.input_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(10, 5))
+        self.input_path.trace_add('write', self.schedule_update_file_info)
         
         self.browse_input_btn = ttk.Button(input_path_frame, text="Browse...", 
                                           command=self.browse_input)
@@ -335,8 +467,7 @@ class VideoConverterGUI:
         
         ttk.Label(codec_frame, text="Output codec:").pack(side=tk.LEFT)
         self.output_codec = tk.StringVar(value="hevc")
-        output_codec_names = [SUPPORTED_CODECS["output"][c]["name"] for c in SUPPORTED_CODECS["output"]]
-        output_codec_values = list(SUPPORTED_CODECS["output"].keys())
+        output_codec_names = [info["name"] for info in SUPPORTED_CODECS["output"].values()]
         
         self.codec_combo = ttk.Combobox(codec_frame, textvariable=self.output_codec,
                                        values=output_codec_names, state="readonly", width=20)
@@ -414,9 +545,11 @@ class VideoConverterGUI:
         self.info_frame_main = ttk.LabelFrame(main_frame, text="File Information", padding="10")
         self.info_frame_main.pack(fill=tk.BOTH, expand=True, pady=(10, 0))
         
-        self.info_text = scrolledtext.ScrolledText(self.info_frame_main, height=8, 
-                                                  font=("Consolas", 9))
-        self.info_text.pack(fill=tk.BOTH, expand=True)
+        # The scrollbar is only created and shown once the text overflows
+        self._info_scrollbar = None
+        self.info_text = tk.Text(self.info_frame_main, height=8, font=("Consolas", 9),
+                                 undo=False, state='disabled', yscrollcommand=self.on_info_scroll)
+        self.info_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
     
     def setup_settings_tab(self):
         """Setup the settings tab."""
@@ -461,13 +594,19 @@ class VideoConverterGUI:
         advanced_frame = ttk.LabelFrame(settings_frame, text="Advanced Options", padding="10")
         advanced_frame.pack(fill=tk.X, pady=(0, 10))
         
-        self.verbose_logging = tk.BooleanVar(value=False)
         ttk.Checkbutton(advanced_frame, text="Verbose logging", 
                        variable=self.verbose_logging).pack(anchor=tk.W)
         
-        self.auto_detect_hdr = tk.BooleanVar(value=True)
         ttk.Checkbutton(advanced_frame, text="Auto-detect HDR content", 
                        variable=self.auto_detect_hdr).pack(anchor=tk.W)
+        
+        parallel_frame = ttk.Frame(advanced_frame)
+        parallel_frame.pack(anchor=tk.W, pady=(5, 0))
+        ttk.Label(parallel_frame, text="Parallel conversions (batch):").pack(side=tk.LEFT)
+        parallel_spinbox = ttk.Spinbox(parallel_frame, from_=1, to=os.cpu_count() or 1,
+                                       textvariable=self.max_parallel, width=5)
+        parallel_spinbox.pack(side=tk.LEFT, padx=(10, 0))
+        ToolTip(parallel_spinbox, "Videos encoded at the same time in batch mode")
     
     def setup_info_tab(self):
         """Setup the system information tab."""
@@ -478,41 +617,26 @@ class VideoConverterGUI:
         system_frame = ttk.LabelFrame(info_frame, text="System Information", padding="10")
         system_frame.pack(fill=tk.X, pady=(0, 10))
         
-        # FFmpeg status
-        ffmpeg_available = VideoUtils.validate_ffmpeg()
-        status_color = "Success.TLabel" if ffmpeg_available else "Error.TLabel"
-        status_text = "Available ✓" if ffmpeg_available else "Not Found ✗"
-        
+        # FFmpeg status (checked in the background so the window stays responsive)
         ttk.Label(system_frame, text="FFmpeg:").grid(row=0, column=0, sticky=tk.W)
-        ttk.Label(system_frame, text=status_text, style=status_color).grid(row=0, column=1, sticky=tk.W, padx=(10, 0))
+        self.ffmpeg_status_label = ttk.Label(system_frame, text="Checking...")
+        self.ffmpeg_status_label.grid(row=0, column=1, sticky=tk.W, padx=(10, 0))
         
         # GPU acceleration
-        if self.config:
-            gpu_status = f"{self.config.gpu_type.upper()} ✓" if self.config.gpu_type else "Not Available"
-            gpu_color = "Success.TLabel" if self.config.gpu_type else "Warning.TLabel"
-            
-            ttk.Label(system_frame, text="GPU Acceleration:").grid(row=1, column=0, sticky=tk.W)
-            ttk.Label(system_frame, text=gpu_status, style=gpu_color).grid(row=1, column=1, sticky=tk.W, padx=(10, 0))
+        ttk.Label(system_frame, text="GPU Acceleration:").grid(row=1, column=0, sticky=tk.W)
+        self.gpu_status_label = ttk.Label(system_frame)
+        self.gpu_status_label.grid(row=1, column=1, sticky=tk.W, padx=(10, 0))
         
-        # Available encoders
+        # Available encoders; values are filled in by update_system_info
         encoders_frame = ttk.LabelFrame(info_frame, text="Available Encoders", padding="10")
         encoders_frame.pack(fill=tk.X, pady=(0, 10))
         
-        if self.config:
-            row = 0
-            for codec in SUPPORTED_CODECS['output']:
-                codec_name = SUPPORTED_CODECS['output'][codec]['name']
-                ttk.Label(encoders_frame, text=f"{codec_name}:", font=('Arial', 10, 'bold')).grid(row=row, column=0, sticky=tk.W, pady=(5, 0))
-                
-                available = self.config.available_encoders.get(codec, [])
-                if available:
-                    encoder_type, encoder_config = self.config.get_encoder_config(codec)
-                    encoder_name = encoder_config['encoder']
-                    encoder_info = f"{encoder_name} ({encoder_type})"
-                    ttk.Label(encoders_frame, text=encoder_info).grid(row=row, column=1, sticky=tk.W, padx=(10, 0), pady=(5, 0))
-                else:
-                    ttk.Label(encoders_frame, text="Not available", foreground="red").grid(row=row, column=1, sticky=tk.W, padx=(10, 0), pady=(5, 0))
-                row += 1
+        self.encoder_labels = {}
+        for row, (codec, codec_info) in enumerate(SUPPORTED_CODECS['output'].items()):
+            codec_name = codec_info['name']
+            ttk.Label(encoders_frame, text=f"{codec_name}:", font=('Arial', 10, 'bold')).grid(row=row, column=0, sticky=tk.W, pady=(5, 0))
+            self.encoder_labels[codec] = ttk.Label(encoders_frame)
+            self.encoder_labels[codec].grid(row=row, column=1, sticky=tk.W, padx=(10, 0), pady=(5, 0))
         
         # Supported formats
         formats_frame = ttk.LabelFrame(info_frame, text="Supported Input Formats", padding="10")
@@ -525,18 +649,51 @@ class VideoConverterGUI:
         perf_frame = ttk.LabelFrame(info_frame, text="Performance Information", padding="10")
         perf_frame.pack(fill=tk.X, pady=(0, 10))
         
-        if self.config and self.config.gpu_type:
-            perf_text = "Hardware acceleration is available. Expect 3-5x faster conversion speeds."
-            perf_color = "Success.TLabel"
-        else:
-            perf_text = "Using CPU encoding. Consider updating GPU drivers for hardware acceleration."
-            perf_color = "Warning.TLabel"
-        
-        ttk.Label(perf_frame, text=perf_text, style=perf_color, wraplength=600).pack(anchor=tk.W)
+        self.perf_label = ttk.Label(perf_frame, wraplength=600)
+        self.perf_label.pack(anchor=tk.W)
         
         # Refresh button
         ttk.Button(info_frame, text="Refresh System Info", 
                   command=self.refresh_system_info).pack(pady=(10, 0))
+        
+        self.update_system_info()
+    
+    def update_system_info(self):
+        """Fill the system information tab from the current configuration."""
+        self.ffmpeg_status_label.config(text="Checking...", style="TLabel")
+        ffmpeg_check = threading.Thread(target=self.check_ffmpeg, daemon=True)
+        ffmpeg_check.start()
+        self.track_background(ffmpeg_check.is_alive)
+        
+        gpu_type = self.config.gpu_type if self.config else None
+        self.gpu_status_label.config(
+            text=f"{gpu_type.upper()} ✓" if gpu_type else "Not Available",
+            style="Success.TLabel" if gpu_type else "Warning.TLabel"
+        )
+        
+        for codec, label in self.encoder_labels.items():
+            if self.config and self.config.available_encoders.get(codec):
+                encoder_type, encoder_config = self.config.get_encoder_config(codec)
+                label.config(text=f"{encoder_config['encoder']} ({encoder_type})", foreground="")
+            else:
+                label.config(text="Not available", foreground="red")
+        
+        if gpu_type:
+            self.perf_label.config(text="Hardware acceleration is available. Expect 3-5x faster conversion speeds.",
+                                   style="Success.TLabel")
+        else:
+            self.perf_label.config(text="Using CPU encoding. Consider updating GPU drivers for hardware acceleration.",
+                                   style="Warning.TLabel")
+    
+    def check_ffmpeg(self):
+        """Check FFmpeg availability and report it to the GUI thread."""
+        self.message_queue.put(('ffmpeg_status', VideoUtils.validate_ffmpeg()))
+    
+    def on_tab_changed(self, event=None):
+        """Build a tab's contents the first time it is selected."""
+        builder = self._tab_builders.pop(self.notebook.select(), None)
+        if builder:
+            builder()
     
     def setup_status_bar(self):
         """Setup the status bar at the bottom."""
@@ -548,13 +705,28 @@ class VideoConverterGUI:
     
     def center_window(self):
         """Center the window on the screen."""
-        self.root.update_idletasks()
-        width = self.root.winfo_width()
-        height = self.root.winfo_height()
+        # The size is fixed at startup, so there's no need to flush geometry to measure it
+        width = self.WINDOW_WIDTH
+        height = self.WINDOW_HEIGHT
         x = (self.root.winfo_screenwidth() // 2) - (width // 2)
         y = (self.root.winfo_screenheight() // 2) - (height // 2)
         self.root.geometry(f"{width}x{height}+{x}+{y}")
     
+    def on_info_scroll(self, first, last):
+        """Show the file information scrollbar only while the text overflows."""
+        overflowing = float(first) > 0.0 or float(last) < 1.0
+        if overflowing and self._info_scrollbar is None:
+            self._info_scrollbar = ttk.Scrollbar(self.info_frame_main, orient="vertical",
+                                                 command=self.info_text.yview)
+        
+        if self._info_scrollbar:
+            packed = self._info_scrollbar.winfo_manager() == 'pack'
+            if overflowing and not packed:
+                self._info_scrollbar.pack(side=tk.RIGHT, fill=tk.Y, before=self.info_text)
+            elif not overflowing and packed:
+                self._info_scrollbar.pack_forget()
+            self._info_scrollbar.set(first, last)
+    
     def on_mode_change(self):
         """Handle conversion mode change."""
         mode = self.conversion_mode.get()
@@ -570,19 +742,16 @@ class VideoConverterGUI:
         # Clear current paths
         self.input_path.set("")
         self.output_path.set("")
-        self.update_file_info()
     
     def on_codec_change(self, event=None):
         """Handle output codec change."""
         # Get the selected codec name and find the corresponding key
-        selected_name = self.codec_combo.get()
-        for codec_key, codec_info in SUPPORTED_CODECS["output"].items():
-            if codec_info["name"] == selected_name:
-                self.output_codec.set(codec_key)
-                break
+        codec_key = _OUTPUT_NAME_TO_KEY.get(self.codec_combo.get())
+        if codec_key:
+            self.output_codec.set(codec_key)
         
         # Update HDR checkbox state based on codec support
-        if self.output_codec.get() in ["hevc", "av1"]:
+        if self.output_codec.get() in _HDR_CODECS:
             self.hdr_check.config(state="normal")
         else:
             self.hdr_check.config(state="disabled")
@@ -607,11 +776,7 @@ class VideoConverterGUI:
             return None
         
         # Find the codec key from the display name
-        selected_name = self.codec_filter_combo.get()
-        for codec_key, codec_info in SUPPORTED_CODECS["input"].items():
-            if codec_info["name"] == selected_name:
-                return codec_key
-        return None
+        return _INPUT_NAME_TO_KEY.get(self.codec_filter_combo.get())
     
     def get_selected_output_codec(self) -> str:
         """Get the selected output codec."""
@@ -620,36 +785,19 @@ class VideoConverterGUI:
     
     def on_quality_change(self, value):
         """Handle quality slider change."""
-        quality = int(float(value))
+        # Dragging fires an event per pixel; refresh the label at most every 30 ms
+        if self._quality_after_id is None:
+            self._quality_after_id = self.root.after(30, self._apply_quality)
+    
+    def _apply_quality(self):
+        """Snap the slider to a whole quality value and update its description."""
+        self._quality_after_id = None
+        quality = int(float(self.quality_slider.get()))
         self.quality_var.set(quality)
         
-        # Get codec-specific quality descriptions
-        output_codec = self.output_codec.get()
-        
-        if output_codec in ["av1", "vp9"]:
-            # AV1/VP9 use different quality scale
-            if quality <= 20:
-                desc = f"{quality} (Very High Quality)"
-            elif quality <= 30:
-                desc = f"{quality} (High Quality)"
-            elif quality <= 40:
-                desc = f"{quality} (Medium Quality)"
-            elif quality <= 50:
-                desc = f"{quality} (Lower Quality)"
-            else:
-                desc = f"{quality} (Very Low Quality)"
-        else:
-            # HEVC/H.264 quality scale
-            if quality <= 18:
-                desc = f"{quality} (Very High Quality)"
-            elif quality <= 23:
-                desc = f"{quality} (High Quality)"
-            elif quality <= 28:
-                desc = f"{quality} (Medium Quality)"
-            elif quality <= 35:
-                desc = f"{quality} (Lower Quality)"
-            else:
-                desc = f"{quality} (Very Low Quality)"
+        # Get codec-specific quality description
+        bounds = _QUALITY_BOUNDS.get(self.output_codec.get(), _DEFAULT_QUALITY_BOUNDS)
+        desc = f"{quality} ({_QUALITY_LABELS[bisect_left(bounds, quality)]})"
         
         self.quality_label.config(text=desc)
     
@@ -675,8 +823,6 @@ class VideoConverterGUI:
             directory = filedialog.askdirectory(title="Select Directory with Videos")
             if directory:
                 self.input_path.set(directory)
-        
-        self.update_file_info()
     
     def browse_output(self):
         """Browse for output directory."""
@@ -697,56 +843,110 @@ class VideoConverterGUI:
             if directory:
                 self.output_path.set(directory)
     
+    def schedule_update_file_info(self, *args):
+        """Refresh the file information once the input path stops changing."""
+        # Typing a path writes the variable per keystroke; probe only the final value
+        if self._file_info_after_id is not None:
+            self.root.after_cancel(self._file_info_after_id)
+        self._file_info_after_id = self.root.after(250, self._run_update_file_info)
+    
+    def _run_update_file_info(self):
+        """Run the refresh scheduled by schedule_update_file_info."""
+        self._file_info_after_id = None
+        self.update_file_info()
+    
     def update_file_info(self):
-        """Update the file information display."""
-        self.info_text.delete(1.0, tk.END)
-        
+        """Update the file information display without blocking on ffprobe."""
+        self._info_generation += 1
+        generation = self._info_generation
         input_path = self.input_path.get()
+        mode = self.conversion_mode.get()
+        
         if not input_path:
-            self.info_text.insert(tk.END, "No input selected.\n")
+            self.set_info_text(["No input selected.\n"])
             return
         
+        self.set_info_text(["Reading file information...\n"])
+        future = self._info_pool.submit(self._post_file_info, generation, input_path, mode)
+        self.track_background(lambda: not future.done())
+    
+    def _post_file_info(self, generation: int, input_path: str, mode: str):
+        """Describe an input on the info worker and hand the result to the GUI thread."""
+        try:
+            lines = self._describe_input(
+                input_path, mode, lambda preview: self.message_queue.put(('info_text_update', generation, preview))
+            )
+        except Exception as e:
+            lines = [f"Could not read file information: {e}\n"]
+        self.message_queue.put(('info_text_update', generation, lines))
+    
+    def set_info_text(self, lines: List[str]):
+        """Replace the file information text with the given lines in a single insert."""
+        self.info_text.config(state='normal')
+        self.info_text.delete(1.0, tk.END)
+        self.info_text.insert(tk.END, "".join(lines))
+        self.info_text.config(state='disabled')
+    
+    def _describe_input(self, input_path: str, mode: str,
+                        on_preview: Optional[Callable[[List[str]], None]] = None) -> List[str]:
+        """
+        Build the file information lines for an input (runs on the info worker).
+        
+        Args:
+            input_path: Selected file or directory
+            mode: Conversion mode (single or batch)
+            on_preview: Called with preliminary lines while a large directory is still being counted
+            
+        Returns:
+            Lines for the information panel
+        """
+        lines = []
         path_obj = Path(input_path)
         
-        if self.conversion_mode.get() == "single":
-            if not path_obj.exists():
-                self.info_text.insert(tk.END, "Selected file does not exist.\n")
-                return
+        # One stat answers existence, type and size
+        path_stat = _stat_or_none(path_obj)
+        
+        if mode == "single":
+            if path_stat is None:
+                lines.append("Selected file does not exist.\n")
+                return lines
             
-            if not path_obj.is_file():
-                self.info_text.insert(tk.END, "Selected path is not a file.\n")
-                return
+            if not stat.S_ISREG(path_stat.st_mode):
+                lines.append("Selected path is not a file.\n")
+                return lines
             
             # Check if it's a video
-            codec = VideoUtils.get_video_codec(path_obj)
+            video_info = self.probe_cache.get_info(path_obj)
+            codec = VideoUtils.get_video_codec(path_obj, video_info or {})
             if codec:
                 codec_name = VideoUtils.get_codec_display_name(codec)
-                self.info_text.insert(tk.END, f"✓ Valid video file: {path_obj.name}\n")
-                self.info_text.insert(tk.END, f"Codec: {codec_name}\n")
+                lines.append(f"✓ Valid video file: {path_obj.name}\n")
+                lines.append(f"Codec: {codec_name}\n")
                 
                 # Get file info
-                file_size = VideoUtils.get_file_size_mb(path_obj)
-                has_hdr = VideoUtils.has_hdr_metadata(path_obj)
+                file_size = path_stat.st_size / (1024 * 1024)
+                has_hdr = VideoUtils.has_hdr_metadata(path_obj, video_info)
                 
-                self.info_text.insert(tk.END, f"File size: {file_size:.1f} MB\n")
+                lines.append(f"File size: {file_size:.1f} MB\n")
                 
                 # Show HDR info only for codecs that support it
-                if codec in ["hevc", "av1"]:
-                    self.info_text.insert(tk.END, f"HDR metadata: {'Yes' if has_hdr else 'No'}\n")
+                if codec in _HDR_CODECS:
+                    lines.append(f"HDR metadata: {'Yes' if has_hdr else 'No'}\n")
                 
-                # Get detailed video info
-                video_info = VideoUtils.get_video_info(path_obj)
+                # Detailed video info comes from the same probe
                 if video_info:
                     for stream in video_info.get('streams', []):
                         if stream.get('codec_type') == 'video':
                             width = stream.get('width', 'Unknown')
                             height = stream.get('height', 'Unknown')
-                            self.info_text.insert(tk.END, f"Resolution: {width}x{height}\n")
+                            lines.append(f"Resolution: {width}x{height}\n")
                             
-                            fps = stream.get('r_frame_rate', '').split('/')
-                            if len(fps) == 2 and fps[1] != '0':
-                                fps_val = float(fps[0]) / float(fps[1])
-                                self.info_text.insert(tk.END, f"Frame rate: {fps_val:.2f} fps\n")
+                            # ffprobe reports the rate as an integer fraction such as "24000/1001"
+                            num, _, den = stream.get('r_frame_rate', '').partition('/')
+                            try:
+                                lines.append(f"Frame rate: {int(num) / int(den):.2f} fps\n")
+                            except (ValueError, ZeroDivisionError):
+                                pass
                             break
                 
                 # Estimate conversion time
@@ -754,54 +954,117 @@ class VideoConverterGUI:
                     estimated_time = VideoUtils.estimate_conversion_time(
                         file_size, self.config.gpu_type is not None
                     )
-                    self.info_text.insert(tk.END, f"Estimated conversion time: {estimated_time}\n")
+                    lines.append(f"Estimated conversion time: {estimated_time}\n")
             else:
-                self.info_text.insert(tk.END, f"✗ Not a video file: {path_obj.name}\n")
-                self.info_text.insert(tk.END, "Please select a valid video file.\n")
+                lines.append(f"✗ Not a video file: {path_obj.name}\n")
+                lines.append("Please select a valid video file.\n")
         
         else:  # Batch mode
-            if not path_obj.exists():
-                self.info_text.insert(tk.END, "Selected directory does not exist.\n")
-                return
+            if path_stat is None:
+                lines.append("Selected directory does not exist.\n")
+                return lines
             
-            if not path_obj.is_dir():
-                self.info_text.insert(tk.END, "Selected path is not a directory.\n")
-                return
+            if not stat.S_ISDIR(path_stat.st_mode):
+                lines.append("Selected path is not a directory.\n")
+                return lines
             
-            # Find video files
-            video_files = VideoUtils.find_video_files(path_obj)
+            # Reuse the last scan if the directory looks unchanged
+            scan = self._video_scan
+            if scan and scan[:2] == (path_obj, path_stat.st_mtime_ns):
+                video_files = scan[2]
+            else:
+                # Show the first videos as soon as the scan finds them, then count the rest
+                found = VideoUtils.iter_video_files(path_obj)
+                preview = list(islice(found, _PREVIEW_FILES))
+                next_video = next(found, None)
+                if next_video is not None and on_preview:
+                    on_preview(self._describe_videos(preview, None))
+                
+                video_files = preview + ([next_video] if next_video is not None else []) + list(found)
+                video_files.sort()
+                self._video_scan = (path_obj, path_stat.st_mtime_ns, video_files)
             
             if video_files:
-                self.info_text.insert(tk.END, f"✓ Found {len(video_files)} video(s) in directory:\n\n")
-                
-                total_size = 0
-                hdr_count = 0
-                
-                for video in video_files[:10]:  # Show first 10
-                    file_size = VideoUtils.get_file_size_mb(video)
-                    has_hdr = VideoUtils.has_hdr_metadata(video)
-                    total_size += file_size
-                    if has_hdr:
-                        hdr_count += 1
-                    
-                    hdr_indicator = " [HDR]" if has_hdr else ""
-                    self.info_text.insert(tk.END, f"  • {video.name} ({file_size:.1f} MB){hdr_indicator}\n")
-                
-                if len(video_files) > 10:
-                    self.info_text.insert(tk.END, f"  ... and {len(video_files) - 10} more files\n")
-                
-                self.info_text.insert(tk.END, f"\nTotal size: {total_size:.1f} MB\n")
-                self.info_text.insert(tk.END, f"Files with HDR: {hdr_count}\n")
-                
-                # Estimate total conversion time
-                if self.config:
-                    estimated_time = VideoUtils.estimate_conversion_time(
-                        total_size, self.config.gpu_type is not None
-                    )
-                    self.info_text.insert(tk.END, f"Estimated total time: {estimated_time}\n")
+                lines.extend(self._describe_videos(video_files[:_PREVIEW_FILES], len(video_files)))
             else:
-                self.info_text.insert(tk.END, f"✗ No video files found in directory: {path_obj}\n")
-                self.info_text.insert(tk.END, "The directory may be empty or contain no video files.\n")
+                lines.append(f"✗ No video files found in directory: {path_obj}\n")
+                lines.append("The directory may be empty or contain no video files.\n")
+        
+        return lines
+    
+    def _describe_videos(self, preview: List[Path], total: Optional[int]) -> List[str]:
+        """
+        Build the batch file information lines for the first videos of a directory.
+        
+        Args:
+            preview: Videos to list individually
+            total: Number of videos in the directory, or None while still counting
+            
+        Returns:
+            Lines for the information panel
+        """
+        lines = []
+        if total is None:
+            lines.append("✓ Found video(s) in directory, still counting:\n\n")
+        else:
+            lines.append(f"✓ Found {total} video(s) in directory:\n\n")
+        
+        self.probe_cache.prefetch(preview)
+        total_size = 0
+        hdr_count = 0
+        
+        for video in preview:
+            file_size = VideoUtils.get_file_size_mb(video)
+            has_hdr = VideoUtils.has_hdr_metadata(video, self.probe_cache.get_info(video) or {})
+            total_size += file_size
+            if has_hdr:
+                hdr_count += 1
+            
+            hdr_indicator = " [HDR]" if has_hdr else ""
+            lines.append(f"  • {video.name} ({file_size:.1f} MB){hdr_indicator}\n")
+        
+        if total is None:
+            lines.append("  ... and more files\n")
+        elif total > len(preview):
+            lines.append(f"  ... and {total - len(preview)} more files\n")
+        
+        lines.append(f"\nTotal size: {total_size:.1f} MB\n")
+        lines.append(f"Files with HDR: {hdr_count}\n")
+        
+        # Estimate total conversion time
+        if self.config:
+            estimated_time = VideoUtils.estimate_conversion_time(
+                total_size, self.config.gpu_type is not None
+            )
+            lines.append(f"Estimated total time: {estimated_time}\n")
+        
+        return lines
+    
+    def find_video_files(self, directory: Path, refresh: bool = False) -> List[Path]:
+        """
+        Find videos in a directory, reusing the last scan while the directory is unchanged.
+        
+        Only the top-level modification time is checked, which misses changes inside
+        subdirectories, so anything that acts on the list should pass refresh=True.
+        
+        Args:
+            directory: Directory to search for videos
+            refresh: Rescan even if the directory looks unchanged
+            
+        Returns:
+            List of video files
+        """
+        try:
+            mtime = directory.stat().st_mtime_ns
+        except OSError:
+            return []
+        
+        if not refresh and self._video_scan and self._video_scan[:2] == (directory, mtime):
+            return self._video_scan[2]
+        
+        video_files = VideoUtils.find_video_files(directory)
+        self._video_scan = (directory, mtime, video_files)
+        return video_files
     
     def dry_run(self):
         """Perform a dry run to show what would be converted."""
@@ -812,8 +1075,7 @@ class VideoConverterGUI:
         output_path = Path(self.output_path.get()) if self.output_path.get() else None
         output_codec = self.get_selected_output_codec()
         
-        self.info_text.delete(1.0, tk.END)
-        self.info_text.insert(tk.END, "DRY RUN - Preview of conversion:\n\n")
+        lines = ["DRY RUN - Preview of conversion:\n\n"]
         
         if self.conversion_mode.get() == "single":
             output_file = output_path or VideoUtils.generate_output_path(input_path, None, output_codec)
@@ -827,79 +1089,84 @@ class VideoConverterGUI:
                 output_file = input_path.parent / output_file
             
             # Get proper extension for codec
-            codec_extensions = {
-                'hevc': '.mkv',
-                'h264': '.mp4', 
-                'av1': '.mkv',
-                'vp9': '.webm'
-            }
-            
-            if not output_file.suffix or output_file.suffix not in codec_extensions.values():
-                output_file = output_file.with_suffix(codec_extensions.get(output_codec, '.mkv'))
+            if not output_file.suffix or output_file.suffix.lower() not in _OUTPUT_EXTENSIONS:
+                output_file = output_file.with_suffix(CODEC_EXTENSIONS.get(output_codec, '.mkv'))
                 
-            self.info_text.insert(tk.END, f"Input:  {input_path}\n")
-            self.info_text.insert(tk.END, f"Output: {output_file}\n")
+            lines.append(f"Input:  {input_path}\n")
+            lines.append(f"Output: {output_file}\n")
             
             # Show codec conversion
-            input_codec = VideoUtils.get_video_codec(input_path)
+            video_info = self.probe_cache.get_info(input_path) or {}
+            input_codec = VideoUtils.get_video_codec(input_path, video_info)
             if input_codec:
                 input_codec_name = VideoUtils.get_codec_display_name(input_codec)
                 output_codec_name = VideoUtils.get_codec_display_name(output_codec)
-                self.info_text.insert(tk.END, f"Codec:  {input_codec_name} → {output_codec_name}\n")
+                lines.append(f"Codec:  {input_codec_name} → {output_codec_name}\n")
             
             file_size = VideoUtils.get_file_size_mb(input_path)
-            has_hdr = VideoUtils.has_hdr_metadata(input_path)
+            has_hdr = VideoUtils.has_hdr_metadata(input_path, video_info)
             
-            self.info_text.insert(tk.END, f"Size:   {file_size:.1f} MB\n")
+            lines.append(f"Size:   {file_size:.1f} MB\n")
             
             # Show HDR only if relevant
-            if output_codec in ["hevc", "av1"] and has_hdr:
-                self.info_text.insert(tk.END, f"HDR:    Yes (will be preserved)\n")
+            if output_codec in _HDR_CODECS and has_hdr:
+                lines.append(f"HDR:    Yes (will be preserved)\n")
             elif has_hdr:
-                self.info_text.insert(tk.END, f"HDR:    Yes (will be lost - {output_codec} doesn't support HDR)\n")
+                lines.append(f"HDR:    Yes (will be lost - {output_codec} doesn't support HDR)\n")
             
-            self.info_text.insert(tk.END, f"Quality: {self.quality_var.get()}\n")
+            lines.append(f"Quality: {self.quality_var.get()}\n")
             
             if self.config:
                 encoder_type, encoder_config = self.config.get_encoder_config(output_codec)
-                self.info_text.insert(tk.END, f"Encoder: {encoder_config['encoder']} ({encoder_type})\n")
+                lines.append(f"Encoder: {encoder_config['encoder']} ({encoder_type})\n")
         
         else:  # Batch mode
             # Get filter codec if any
             input_codec_filter = self.get_selected_input_codec()
-            video_files = VideoUtils.find_videos_by_codec(input_path, input_codec_filter)
+            # validate_inputs has just scanned the directory; filter that list instead of walking it again
+            video_files = self.find_video_files(input_path)
+            if input_codec_filter:
+                video_files = VideoUtils.filter_videos_by_codec(
+                    video_files, input_codec_filter, probe_cache=self.probe_cache
+                )
             output_dir = output_path or input_path
             
             # Ensure output_dir is a Path object
             if not isinstance(output_dir, Path):
                 output_dir = Path(output_dir)
             
-            self.info_text.insert(tk.END, f"Input directory:  {input_path}\n")
-            self.info_text.insert(tk.END, f"Output directory: {output_dir}\n")
+            lines.append(f"Input directory:  {input_path}\n")
+            lines.append(f"Output directory: {output_dir}\n")
             
             if input_codec_filter:
                 filter_name = VideoUtils.get_codec_display_name(input_codec_filter)
-                self.info_text.insert(tk.END, f"Input filter:     {filter_name} files only\n")
+                lines.append(f"Input filter:     {filter_name} files only\n")
             
             output_codec_name = VideoUtils.get_codec_display_name(output_codec)
-            self.info_text.insert(tk.END, f"Output codec:     {output_codec_name}\n")
-            self.info_text.insert(tk.END, f"Files to convert: {len(video_files)}\n\n")
+            lines.append(f"Output codec:     {output_codec_name}\n")
+            lines.append(f"Files to convert: {len(video_files)}\n\n")
             
-            for video in video_files[:10]:  # Show first 10
-                input_codec = VideoUtils.get_video_codec(video)
+            self.probe_cache.prefetch(video_files[:_PREVIEW_FILES])
+            for video in video_files[:_PREVIEW_FILES]:
+                video_info = self.probe_cache.get_info(video) or {}
+                input_codec = VideoUtils.get_video_codec(video, video_info)
                 if input_codec == output_codec:
-                    self.info_text.insert(tk.END, f"  [SKIP] {video.name} - already in {output_codec_name} format\n")
+                    lines.append(f"  [SKIP] {video.name} - already in {output_codec_name} format\n")
                 else:
-                    output_file = VideoUtils.generate_output_path(video, output_dir, output_codec)
+                    output_name = VideoUtils.generate_output_name(video, output_codec, input_codec=input_codec)
                     file_size = VideoUtils.get_file_size_mb(video)
-                    has_hdr = VideoUtils.has_hdr_metadata(video)
+                    has_hdr = VideoUtils.has_hdr_metadata(video, video_info)
                     hdr_indicator = " [HDR]" if has_hdr else ""
                     
-                    self.info_text.insert(tk.END, 
-                        f"  {video.name} ({file_size:.1f} MB){hdr_indicator} → {output_file.name}\n")
+                    lines.append(
+                        f"  {video.name} ({file_size:.1f} MB){hdr_indicator} → {output_name}\n")
             
-            if len(video_files) > 10:
-                self.info_text.insert(tk.END, f"  ... and {len(video_files) - 10} more files\n")
+            if len(video_files) > _PREVIEW_FILES:
+                lines.append(f"  ... and {len(video_files) - _PREVIEW_FILES} more files\n")
+        
+        # Keep a file description still in flight from replacing the preview
+        self._info_generation += 1
+        self.set_info_text(lines)
     
     def validate_inputs(self):
         """Validate user inputs before conversion."""
@@ -908,7 +1175,7 @@ class VideoConverterGUI:
             return False
         
         input_path = Path(self.input_path.get())
-        if not input_path.exists():
+        if _stat_or_none(input_path) is None:
             messagebox.showerror("Input Error", "Selected input path does not exist.")
             return False
         
@@ -917,7 +1184,8 @@ class VideoConverterGUI:
                 messagebox.showerror("Input Error", "Selected file is not a video.")
                 return False
         else:
-            video_files = VideoUtils.find_video_files(input_path)
+            # Rescan so a conversion started after this check sees the directory as it is now
+            video_files = self.find_video_files(input_path, refresh=True)
             if not video_files:
                 messagebox.showerror("Input Error", "No video files found in selected directory.")
                 return False
@@ -933,7 +1201,7 @@ class VideoConverterGUI:
             output_text = self.output_path.get().strip()
             if self.conversion_mode.get() == "single":
                 # Check if it looks like a valid filename/path
-                if output_text and not any(c in output_text for c in ['/', '\\', ':']):
+                if output_text and _PATH_SEPARATORS.isdisjoint(output_text):
                     # Just a filename, which is okay - we'll make it absolute later
                     pass
                 elif output_text.count('.') > 1 and '/' not in output_text and '\\' not in output_text:
@@ -961,15 +1229,27 @@ class VideoConverterGUI:
         # Start conversion in separate thread
         conversion_thread = threading.Thread(target=self.run_conversion, daemon=True)
         conversion_thread.start()
+        self.track_background(conversion_thread.is_alive)
     
     def run_conversion(self):
         """Run the actual conversion in a separate thread."""
         try:
+            # Snapshot the Tk variables once; the progress callbacks run per progress update
+            # and only touch these plain locals
             input_path = Path(self.input_path.get())
-            output_path = Path(self.output_path.get()) if self.output_path.get() else None
+            output_text = self.output_path.get()
+            output_path = Path(output_text) if output_text else None
             quality = self.quality_var.get()
             preserve_hdr = self.preserve_hdr.get()
             output_codec = self.get_selected_output_codec()
+            overwrite_existing = self.overwrite_existing.get()
+            try:
+                max_parallel = max(1, self.max_parallel.get())
+            except tk.TclError:
+                # Not a number (e.g. the spinbox was cleared); use the configured default
+                max_parallel = None
+            progress_window = self.progress_window
+            message_queue = self.message_queue
             
             if self.conversion_mode.get() == "single":
                 # Single file conversion
@@ -983,36 +1263,33 @@ class VideoConverterGUI:
                 if not output_file.is_absolute():
                     output_file = input_path.parent / output_file
                 
-                # Get proper extension for codec
-                codec_extensions = {
-                    'hevc': '.mkv',
-                    'h264': '.mp4',
-                    'av1': '.mkv',
-                    'vp9': '.webm'
-                }
-                
-                # Ensure the file has proper extension
-                if not output_file.suffix or output_file.suffix not in codec_extensions.values():
-                    output_file = output_file.with_suffix(codec_extensions.get(output_codec, '.mkv'))
+                # Ensure the file has proper extension for the codec
+                if not output_file.suffix or output_file.suffix.lower() not in _OUTPUT_EXTENSIONS:
+                    output_file = output_file.with_suffix(CODEC_EXTENSIONS.get(output_codec, '.mkv'))
                 
                 # Log the final output path for debugging
                 self.message_queue.put(('log', f"Output file will be: {output_file}"))
                 
                 # Check if output exists and handle overwrite
-                if output_file.exists() and not self.overwrite_existing.get():
+                if output_file.exists() and not overwrite_existing:
                     self.message_queue.put(('error', f"Output file exists: {output_file}"))
                     return
                 
+                converter = self.converter
+                input_name = input_path.name
+                
                 def progress_callback(progress: ConversionProgress):
-                    if self.progress_window and self.progress_window.cancelled:
+                    if progress_window and progress_window.cancelled:
                         # Actually cancel the conversion
-                        self.converter.cancel_conversion()
+                        converter.cancel_conversion()
                         raise InterruptedError("Conversion cancelled by user")
-                    self.message_queue.put(('file_progress', input_path.name, progress))
+                    message_queue.put(('file_progress', input_name, progress))
                 
                 self.message_queue.put(('log', f"Starting conversion of {input_path.name}"))
-                success = self.converter.convert_video(
-                    input_path, output_file, output_codec, quality, preserve_hdr, progress_callback
+                converter.reset_cancel()
+                success = converter.convert_video(
+                    input_path, output_file, output_codec, quality, preserve_hdr, progress_callback,
+                    probe_cache=self.probe_cache
                 )
                 
                 if success:
@@ -1030,20 +1307,23 @@ class VideoConverterGUI:
                 
                 # Get input codec filter
                 input_codec_filter = self.get_selected_input_codec()
+                batch_converter = self.batch_converter
                 
                 def batch_progress_callback(filename: str, current: int, total: int, progress: ConversionProgress):
-                    if self.progress_window and self.progress_window.cancelled:
+                    if progress_window and progress_window.cancelled:
                         # Actually cancel the conversion
-                        self.batch_converter.cancel_conversion()
+                        batch_converter.cancel_conversion()
                         raise InterruptedError("Conversion cancelled by user")
                     
-                    self.message_queue.put(('batch_progress', current, total))
-                    self.message_queue.put(('file_progress', filename, progress))
+                    message_queue.put(('batch_progress', current, total))
+                    message_queue.put(('file_progress', filename, progress))
                 
                 self.message_queue.put(('log', f"Starting batch conversion in {input_path}"))
-                results = self.batch_converter.convert_directory(
+                results = batch_converter.convert_directory(
                     input_path, output_dir, input_codec_filter, output_codec, 
-                    quality, preserve_hdr, batch_progress_callback
+                    quality, preserve_hdr, batch_progress_callback,
+                    video_files=self.find_video_files(input_path),
+                    max_parallel=max_parallel
                 )
                 
                 # Report results
@@ -1054,35 +1334,72 @@ class VideoConverterGUI:
         except Exception as e:
             self.message_queue.put(('error', f"Conversion error: {str(e)}"))
     
+    def track_background(self, is_running: Callable[[], bool]):
+        """Keep polling the message queue until a background task reports it has finished."""
+        self._background_tasks.append(is_running)
+        self.schedule_poll()
+    
+    def schedule_poll(self):
+        """Process queued messages soon, unless a poll is already scheduled."""
+        if self._poll_after_id is None:
+            self._poll_after_id = self.root.after(50, self.process_messages)
+    
     def process_messages(self):
         """Process messages from the conversion thread."""
+        self._poll_after_id = None
+        # Check for finished tasks before draining: anything they queued is then already
+        # in the queue, so stopping the poll afterwards cannot strand a message
+        self._background_tasks = [task for task in self._background_tasks if task()]
+        
+        # Drain everything queued since the last tick; the status bar and progress
+        # bars only need the newest values
+        latest_log = None
+        latest_file_progress = None
+        latest_batch_progress = None
         try:
             while True:
                 message = self.message_queue.get_nowait()
                 msg_type = message[0]
                 
+                if msg_type == 'log_record':
+                    levelno, text = message[1], message[2]
+                    if levelno < logging.INFO and not self.verbose_logging.get():
+                        continue
+                    message = ('log', f"{logging.getLevelName(levelno)}: {text}")
+                    msg_type = 'log'
+                
                 if msg_type == 'log':
-                    self.status_label.config(text=message[1])
+                    latest_log = message[1]
                     if self.progress_window:
                         self.progress_window.add_log(message[1])
                 
+                elif msg_type == 'ffmpeg_status':
+                    ffmpeg_available = message[1]
+                    self.ffmpeg_status_label.config(
+                        text="Available ✓" if ffmpeg_available else "Not Found ✗",
+                        style="Success.TLabel" if ffmpeg_available else "Error.TLabel"
+                    )
+                
+                elif msg_type == 'info_text_update':
+                    # Ignore descriptions of an input that has since changed
+                    if message[1] == self._info_generation:
+                        self.set_info_text(message[2])
+                
                 elif msg_type == 'file_progress':
-                    if self.progress_window:
-                        filename, progress = message[1], message[2]
-                        self.progress_window.update_file_progress(filename, progress)
+                    latest_file_progress = message
                 
                 elif msg_type == 'batch_progress':
-                    if self.progress_window:
-                        current, total = message[1], message[2]
-                        self.progress_window.update_batch_progress(current, total)
+                    latest_batch_progress = message
                 
                 elif msg_type == 'success':
+                    latest_log = latest_file_progress = latest_batch_progress = None
                     if self.progress_window:
                         self.progress_window.conversion_completed(True, message[1])
                     self.status_label.config(text=message[1])
                     self.convert_btn.config(state="normal")
                 
                 elif msg_type == 'error':
+                    latest_log = latest_file_progress = latest_batch_progress = None
                     if self.progress_window:
                         self.progress_window.conversion_completed(False, message[1])
                     self.status_label.config(text=f"Error: {message[1]}")
@@ -1090,12 +1407,14 @@ class VideoConverterGUI:
                     messagebox.showerror("Conversion Error", message[1])
                 
                 elif msg_type == 'cancelled':
+                    latest_log = latest_file_progress = latest_batch_progress = None
                     if self.progress_window:
                         self.progress_window.conversion_completed(False, message[1])
                     self.status_label.config(text=message[1])
                     self.convert_btn.config(state="normal")
                 
                 elif msg_type == 'batch_complete':
+                    latest_log = latest_file_progress = latest_batch_progress = None
                     results = message[1]
                     success_msg = f"Batch conversion completed: {results['successful']} successful, {results['failed']} failed"
                     if self.progress_window:
@@ -1106,18 +1425,26 @@ class VideoConverterGUI:
         except queue.Empty:
             pass
         
-        # Schedule next check
-        self.root.after(100, self.process_messages)
+        if latest_log is not None:
+            self.status_label.config(text=latest_log)
+        if self.progress_window:
+            if latest_file_progress is not None:
+                self.progress_window.update_file_progress(latest_file_progress[1], latest_file_progress[2])
+            if latest_batch_progress is not None:
+                self.progress_window.update_batch_progress(latest_batch_progress[1], latest_batch_progress[2])
+        
+        # Keep polling only while background work can still post messages
+        if self._background_tasks:
+            self.schedule_poll()
     
     def refresh_system_info(self):
         """Refresh system information."""
         # Reinitialize converter to detect current system state
         self.init_converter()
         
-        # Rebuild info tab
-        for widget in self.info_frame.winfo_children():
-            widget.destroy()
-        self.setup_info_tab()
+        # Update the info tab in place; if it hasn't been built yet it reads the new config when first shown
+        if str(self.info_frame) not in self._tab_builders:
+            self.update_system_info()
         
         self.status_label.config(text="System information refreshed")
     
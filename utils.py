@@ -3,52 +3,187 @@ Utility module for video converter.
 Handles file operations, validation, and helper functions.
 """
 
+import asyncio
 import os
 import subprocess
 import json
 import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple
 
-from config import SUPPORTED_CODECS
+from config import (SUPPORTED_CODECS, CODEC_EXTENSIONS, FFPROBE_ARGS, FFPROBE_VIDEO_ARGS,
+                    MAX_PROBE_WORKERS, MAX_SCAN_WORKERS, SCAN_SKIP_DIRS)
+
+
+# Bytes read from the start of a file when sniffing its video codec
+_SNIFF_BYTES = 64 * 1024
+
+# Matroska/WebM CodecID and ISO-BMFF (MP4/MOV) sample entry -> our codec names
+_MATROSKA_CODEC_IDS = {
+    b'V_AV1': 'av1',
+    b'V_MPEGH/ISO/HEVC': 'hevc',
+    b'V_MPEG4/ISO/AVC': 'h264',
+    b'V_VP9': 'vp9',
+    b'V_VP8': 'vp8',
+}
+_MP4_SAMPLE_ENTRIES = {
+    b'av01': 'av1',
+    b'hvc1': 'hevc',
+    b'hev1': 'hevc',
+    b'avc1': 'h264',
+    b'avc3': 'h264',
+    b'vp09': 'vp9',
+}
+
+# FFmpeg codec names -> our standard names
+_CODEC_ALIASES = {
+    'av1': 'av1',
+    'hevc': 'hevc',
+    'h265': 'hevc',
+    'h264': 'h264',
+    'avc': 'h264',
+    'vp9': 'vp9',
+    'vp8': 'vp8',
+    'mpeg2video': 'mpeg2',
+    'mpeg4': 'mpeg4',
+}
+
+# PQ/HLG transfer functions and side data that mark a stream as HDR
+_HDR_TRANSFERS = frozenset({'smpte2084', 'arib-std-b67'})
+_HDR_SIDE_DATA = frozenset({'Mastering display metadata', 'Content light level metadata'})
+
+# Codecs a container can hold, for extensions that restrict them (others may hold anything)
+_EXT_POSSIBLE_CODECS = {
+    '.webm': frozenset({'vp8', 'vp9', 'av1'}),
+    '.mpg': frozenset({'mpeg1video', 'mpeg2', 'mpeg4', 'h264', 'hevc'}),
+    '.mpeg': frozenset({'mpeg1video', 'mpeg2', 'mpeg4', 'h264', 'hevc'}),
+}
 
 
 class VideoUtils:
     """Utility class for video file operations and validation."""
     
     # Supported video file extensions
-    VIDEO_EXTENSIONS = {'.mkv', '.mp4', '.m4v', '.mov', '.avi', '.webm', '.mpg', '.mpeg', '.wmv', '.flv'}
+    VIDEO_EXTENSIONS = frozenset({'.mkv', '.mp4', '.m4v', '.mov', '.avi', '.webm', '.mpg', '.mpeg', '.wmv', '.flv'})
+    
+    # Set once FFmpeg has been found; a missing FFmpeg is re-checked so installing it takes effect
+    _ffmpeg_available = False
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
     
     @staticmethod
-    def find_videos_by_codec(directory: Path, target_codec: Optional[str] = None) -> List[Path]:
+    def find_videos_by_codec(directory: Path, target_codec: Optional[str] = None,
+                             probe_cache: Optional['ProbeCache'] = None) -> List[Path]:
         """
         Find video files with specific codec in the given directory.
         
         Args:
             directory: Directory to search for videos
             target_codec: Target codec to filter by (None means all videos)
+            probe_cache: Optional cache to reuse ffprobe results from
             
         Returns:
             List of Path objects for video files
         """
-        videos = []
+        videos = list(VideoUtils.iter_video_files(directory))
         
-        for file_path in directory.rglob('*'):
-            if (file_path.is_file() and 
-                file_path.suffix.lower() in VideoUtils.VIDEO_EXTENSIONS):
-                
-                if target_codec:
-                    codec = VideoUtils.get_video_codec(file_path)
-                    if codec == target_codec:
-                        videos.append(file_path)
-                else:
-                    videos.append(file_path)
+        if target_codec:
+            videos = VideoUtils.filter_videos_by_codec(videos, target_codec, probe_cache)
         
         return sorted(videos)
     
+    @staticmethod
+    def filter_videos_by_codec(videos: List[Path], target_codec: str,
+                               probe_cache: Optional['ProbeCache'] = None) -> List[Path]:
+        """
+        Keep the videos encoded with a specific codec, in their original order.
+        
+        Args:
+            videos: Video files to filter, e.g. from an earlier directory scan
+            target_codec: Codec to keep
+            probe_cache: Optional cache to reuse ffprobe results from
+            
+        Returns:
+            List of Path objects for the matching video files
+        """
+        # Skip files whose container cannot hold the target codec without opening them
+        videos = [file_path for file_path in videos
+                  if target_codec in _EXT_POSSIBLE_CODECS.get(file_path.suffix.lower(), (target_codec,))]
+        
+        # Settle what the container headers can, then probe the rest concurrently
+        codecs = VideoUtils.sniff_codecs(videos)
+        unknown = [file_path for file_path, codec in codecs.items() if codec is None]
+        if unknown:
+            for file_path, info in (probe_cache or _shared_probe_cache).prefetch(unknown).items():
+                codecs[file_path] = VideoUtils.get_video_codec(file_path, info or {})
+        return [file_path for file_path in videos if codecs[file_path] == target_codec]
+    
+    @staticmethod
+    def _scan_directory(directory: str) -> Tuple[List[Path], List[str]]:
+        """Return the video files and subdirectories (minus skipped ones) directly inside a directory."""
+        extensions = VideoUtils.VIDEO_EXTENSIONS
+        videos = []
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    # Slice the extension off the name directly (a leading dot is not an
+                    # extension, as with Path.suffix) and only lowercase it if needed
+                    name = entry.name
+                    dot = name.rfind('.')
+                    ext = name[dot:] if dot > 0 else ''
+                    try:
+                        if (ext and (ext in extensions or ext.lower() in extensions)
+                                and entry.is_file()):
+                            videos.append(Path(entry.path))
+                        elif entry.is_dir(follow_symlinks=False):
+                            # Prune VCS, cache and system folders instead of walking them
+                            if not name.startswith('.') and name not in SCAN_SKIP_DIRS:
+                                subdirs.append(entry.path)
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        return videos, subdirs
+    
+    @staticmethod
+    def iter_video_files(directory: Path) -> Iterator[Path]:
+        """
+        Lazily yield video files below a directory, scanning each directory level in parallel.
+        
+        Files are yielded as soon as their directory level has been read, in no
+        particular order, so callers that only need the first few can stop early.
+        
+        Args:
+            directory: Directory to search for videos
+            
+        Yields:
+            Path objects for video files
+        """
+        pending = [str(directory)]
+        pool = None
+        try:
+            while pending:
+                if len(pending) == 1:
+                    # Flat directories are the common case; skip the pool for them
+                    levels = [VideoUtils._scan_directory(pending[0])]
+                else:
+                    if pool is None:
+                        pool = ThreadPoolExecutor(max_workers=MAX_SCAN_WORKERS)
+                    levels = pool.map(VideoUtils._scan_directory, pending)
+                
+                pending = []
+                for level_videos, subdirs in levels:
+                    yield from level_videos
+                    pending.extend(subdirs)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+    
     @staticmethod
     def find_av1_videos(directory: Path) -> List[Path]:
         """
@@ -64,51 +199,96 @@ class VideoUtils:
         return VideoUtils.find_videos_by_codec(directory, 'av1')
     
     @staticmethod
-    def get_video_codec(file_path: Path) -> Optional[str]:
+    def get_video_codec(file_path: Path, info: Optional[Dict] = None) -> Optional[str]:
         """
         Get the video codec of a file.
         
         Args:
             file_path: Path to the video file
+            info: Already probed video information (skips running ffprobe)
             
         Returns:
             Codec name (av1, hevc, h264, vp9, etc.) or None if detection fails
         """
+        if info is None:
+            # Most files name their codec in the first few KB; only probe when they don't
+            codec = VideoUtils._sniff_codec(file_path)
+            if codec:
+                return codec
+            info = _shared_probe_cache.get_info(file_path)
+        if not info:
+            return None
+        return VideoUtils._codec_from_info(info)
+    
+    @staticmethod
+    def _sniff_codec(file_path: Path) -> Optional[str]:
+        """
+        Detect the first video track's codec from the container header, without ffprobe.
+        
+        Understands Matroska/WebM track entries and MP4/MOV sample descriptions found
+        within the first _SNIFF_BYTES of the file.
+        
+        Args:
+            file_path: Path to the video file
+            
+        Returns:
+            Codec name, or None if the header doesn't settle it (callers then probe)
+        """
         try:
-            result = subprocess.run([
-                'ffprobe', '-v', 'quiet', '-print_format', 'json',
-                '-show_streams', str(file_path)
-            ], capture_output=True, text=True, timeout=30)
+            with open(file_path, 'rb') as f:
+                header = f.read(_SNIFF_BYTES)
+        except OSError:
+            return None
+        
+        if header.startswith(b'\x1a\x45\xdf\xa3'):
+            # CodecID element (0x86) with a one-byte size; video codec IDs start with "V_"
+            pos = header.find(b'\x86')
+            while pos != -1:
+                size_byte = header[pos + 1:pos + 2]
+                if size_byte and size_byte[0] & 0x80 and header[pos + 2:pos + 4] == b'V_':
+                    codec_id = header[pos + 2:pos + 2 + (size_byte[0] & 0x7f)].rstrip(b'\x00')
+                    return _MATROSKA_CODEC_IDS.get(codec_id)
+                pos = header.find(b'\x86', pos + 1)
+        
+        elif header[4:8] == b'ftyp':
+            # stsd box: version/flags, entry count, then the first entry's size and format
+            pos = header.find(b'stsd')
+            while pos != -1:
+                codec = _MP4_SAMPLE_ENTRIES.get(header[pos + 16:pos + 20])
+                if codec:
+                    return codec
+                pos = header.find(b'stsd', pos + 4)
+        
+        return None
+    
+    @staticmethod
+    def sniff_codecs(file_paths: Iterable[Path]) -> Dict[Path, Optional[str]]:
+        """
+        Sniff the codec of several files from their headers, reading them in parallel.
+        
+        Args:
+            file_paths: Paths of the video files to sniff
             
-            if result.returncode == 0:
-                data = json.loads(result.stdout)
-                for stream in data.get('streams', []):
-                    if stream.get('codec_type') == 'video':
-                        codec_name = stream.get('codec_name', '').lower()
-                        
-                        # Map FFmpeg codec names to our standard names
-                        codec_mapping = {
-                            'av1': 'av1',
-                            'hevc': 'hevc',
-                            'h265': 'hevc',
-                            'h264': 'h264',
-                            'avc': 'h264',
-                            'vp9': 'vp9',
-                            'vp8': 'vp8',
-                            'mpeg2video': 'mpeg2',
-                            'mpeg4': 'mpeg4',
-                        }
-                        
-                        for key, value in codec_mapping.items():
-                            if key in codec_name:
-                                return value
-                        
-                        # Return original codec name if not in mapping
-                        return codec_name
+        Returns:
+            Dictionary mapping each path to its codec (None where ffprobe is still needed)
+        """
+        file_paths = list(file_paths)
+        if len(file_paths) <= 1:
+            return {path: VideoUtils._sniff_codec(path) for path in file_paths}
         
-        except (subprocess.TimeoutExpired, subprocess.CalledProcessError, 
-                json.JSONDecodeError, FileNotFoundError):
-            pass
+        # The header reads block on I/O with the GIL released, so a thread pool
+        # keeps several of them in flight instead of paying each latency in turn
+        with ThreadPoolExecutor(max_workers=min(MAX_SCAN_WORKERS, len(file_paths))) as pool:
+            return dict(zip(file_paths, pool.map(VideoUtils._sniff_codec, file_paths)))
+    
+    @staticmethod
+    def _codec_from_info(info: Dict) -> Optional[str]:
+        """Extract our standard codec name from ffprobe stream information."""
+        for stream in info.get('streams', []):
+            if stream.get('codec_type') == 'video':
+                codec_name = stream.get('codec_name', '').lower()
+                # Unknown codecs keep their FFmpeg name
+                return _CODEC_ALIASES.get(codec_name, codec_name)
         
         return None
     
@@ -129,7 +309,9 @@ class VideoUtils:
     @staticmethod
     def get_video_info(file_path: Path) -> Optional[Dict]:
         """
-        Get detailed video information using ffprobe.
+        Get detailed video information (all streams and the format section) using ffprobe.
+        
+        Conversions and scans use the narrower, cached probe in ProbeCache instead.
         
         Args:
             file_path: Path to the video file
@@ -137,14 +319,30 @@ class VideoUtils:
         Returns:
             Dictionary with video information or None if failed
         """
+        return VideoUtils._run_ffprobe(file_path, full=True)
+    
+    @staticmethod
+    def _ffprobe_command(file_path: Path, full: bool = False) -> Tuple[str, ...]:
+        """Build the ffprobe command: the first video stream and duration, or everything if full."""
+        return (FFPROBE_ARGS if full else FFPROBE_VIDEO_ARGS) + (str(file_path),)
+    
+    @staticmethod
+    def _parse_ffprobe_output(output: bytes) -> Dict:
+        """Parse ffprobe's JSON output (raises json.JSONDecodeError if malformed)."""
         try:
-            result = subprocess.run([
-                'ffprobe', '-v', 'quiet', '-print_format', 'json',
-                '-show_streams', '-show_format', str(file_path)
-            ], capture_output=True, text=True, timeout=30)
+            return json.loads(output)
+        except UnicodeDecodeError:
+            # Container tags are not always valid UTF-8; decode leniently only when needed
+            return json.loads(output.decode('utf-8', errors='replace'))
+    
+    @staticmethod
+    def _run_ffprobe(file_path: Path, full: bool = False) -> Optional[Dict]:
+        """Run ffprobe on a file and return its parsed stream and format information."""
+        try:
+            result = subprocess.run(VideoUtils._ffprobe_command(file_path, full), capture_output=True, timeout=30)
             
             if result.returncode == 0:
-                return json.loads(result.stdout)
+                return VideoUtils._parse_ffprobe_output(result.stdout)
         
         except (subprocess.TimeoutExpired, subprocess.CalledProcessError, 
                 json.JSONDecodeError, FileNotFoundError):
@@ -153,17 +351,45 @@ class VideoUtils:
         return None
     
     @staticmethod
-    def has_hdr_metadata(file_path: Path) -> bool:
+    async def _run_ffprobe_async(file_path: Path) -> Optional[Dict]:
+        """Asyncio counterpart of _run_ffprobe, for probing many files from one event loop."""
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *VideoUtils._ffprobe_command(file_path),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL
+            )
+        except OSError:
+            return None
+        
+        try:
+            output, _ = await asyncio.wait_for(process.communicate(), timeout=30)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            return None
+        
+        if process.returncode != 0:
+            return None
+        try:
+            return VideoUtils._parse_ffprobe_output(output)
+        except json.JSONDecodeError:
+            return None
+    
+    @staticmethod
+    def has_hdr_metadata(file_path: Path, info: Optional[Dict] = None) -> bool:
         """
         Check if video file contains HDR metadata.
         
         Args:
             file_path: Path to the video file
+            info: Already probed video information (skips running ffprobe)
             
         Returns:
             True if HDR metadata is detected
         """
-        info = VideoUtils.get_video_info(file_path)
+        if info is None:
+            info = _shared_probe_cache.get_info(file_path)
         if not info:
             return False
         
@@ -174,7 +400,7 @@ class VideoUtils:
                 color_primaries = stream.get('color_primaries')
                 
                 # HDR10/HDR10+ indicators
-                if (color_transfer in ['smpte2084', 'arib-std-b67'] or
+                if (color_transfer in _HDR_TRANSFERS or
                     color_primaries == 'bt2020'):
                     return True
                 
@@ -182,15 +408,15 @@ class VideoUtils:
                 side_data = stream.get('side_data_list', [])
                 for data in side_data:
                     data_type = data.get('side_data_type')
-                    if data_type in ['Mastering display metadata', 
-                                   'Content light level metadata']:
+                    if data_type in _HDR_SIDE_DATA:
                         return True
         
         return False
     
     @staticmethod
     def generate_output_path(input_path: Path, output_dir: Optional[Path] = None, 
-                           output_codec: str = "hevc", suffix: Optional[str] = None) -> Path:
+                           output_codec: str = "hevc", suffix: Optional[str] = None,
+                           input_codec: Optional[str] = None) -> Path:
         """
         Generate output file path for converted video.
         
@@ -199,6 +425,7 @@ class VideoUtils:
             output_dir: Output directory (defaults to same as input)
             output_codec: Target codec for determining file extension
             suffix: Optional suffix to add to filename
+            input_codec: Codec of the input if already known (skips running ffprobe)
             
         Returns:
             Path object for output file
@@ -206,31 +433,69 @@ class VideoUtils:
         if output_dir is None:
             output_dir = input_path.parent
         
-        # Create output directory if it doesn't exist
+        # Create output directory if it doesn't exist (batches use generate_output_name and
+        # create theirs once up front, so this runs once per single-file conversion)
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        # Determine file extension based on output codec
-        codec_extensions = {
-            'hevc': '.mkv',
-            'h264': '.mp4',
-            'av1': '.mkv',
-            'vp9': '.webm',
-        }
-        extension = codec_extensions.get(output_codec, '.mkv')
+        return output_dir / VideoUtils.generate_output_name(input_path, output_codec, suffix, input_codec)
+    
+    @staticmethod
+    def generate_output_name(input_path: Path, output_codec: str = "hevc",
+                             suffix: Optional[str] = None, input_codec: Optional[str] = None) -> str:
+        """
+        Generate the output file name for a converted video, without touching the filesystem.
         
-        # Generate new filename
-        stem = input_path.stem
+        Args:
+            input_path: Path to input video file
+            output_codec: Target codec for determining file extension
+            suffix: Optional suffix to add to filename
+            input_codec: Codec of the input if already known (skips running ffprobe)
+            
+        Returns:
+            Output file name
+        """
+        # Determine file extension based on output codec
+        extension = CODEC_EXTENSIONS.get(output_codec, '.mkv')
         
         # Add codec info to suffix if not provided
         if suffix is None:
-            input_codec = VideoUtils.get_video_codec(input_path)
+            if input_codec is None:
+                input_codec = VideoUtils.get_video_codec(input_path)
             if input_codec and output_codec:
                 suffix = f"_{input_codec}_to_{output_codec}"
             else:
                 suffix = f"_{output_codec}"
         
-        output_filename = f"{stem}{suffix}{extension}"
-        return output_dir / output_filename
+        return f"{input_path.stem}{suffix}{extension}"
+    
+    @staticmethod
+    def is_rotational_disk(path: Path) -> bool:
+        """
+        Check whether a path lives on a spinning hard disk.
+        
+        Only detectable on Linux (via sysfs); other platforms report False.
+        
+        Args:
+            path: File or directory on the disk to check
+            
+        Returns:
+            True if the underlying block device is rotational
+        """
+        if not hasattr(os, 'major'):
+            return False
+        
+        try:
+            device = path.stat().st_dev
+            block = Path('/sys/dev/block') / f"{os.major(device)}:{os.minor(device)}"
+            # Partitions have no queue of their own; their parent disk does
+            for queue in (block / 'queue', block.resolve().parent / 'queue'):
+                rotational = queue / 'rotational'
+                if rotational.exists():
+                    return rotational.read_text().strip() == '1'
+        except OSError:
+            pass
+        
+        return False
     
     @staticmethod
     def get_file_size_mb(file_path: Path) -> float:
@@ -248,10 +513,14 @@ class VideoUtils:
         Returns:
             True if FFmpeg is available
         """
+        if VideoUtils._ffmpeg_available:
+            return True
+        
         try:
             result = subprocess.run(['ffmpeg', '-version'], 
                                   capture_output=True, timeout=10)
-            return result.returncode == 0
+            VideoUtils._ffmpeg_available = result.returncode == 0
+            return VideoUtils._ffmpeg_available
         except (subprocess.TimeoutExpired, subprocess.CalledProcessError, 
                 FileNotFoundError):
             return False
@@ -330,6 +599,100 @@ class VideoUtils:
         return VideoUtils.find_videos_by_codec(directory, None)
 
 
+class ProbeCache:
+    """Thread-safe cache of ffprobe results keyed by (path, mtime, size)."""
+    
+    def __init__(self, max_entries: int = 4096):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_entries: Number of results kept; the least recently used are dropped first
+        """
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[Tuple[str, int, int], Dict]' = OrderedDict()
+    
+    def get_info(self, file_path: Path) -> Optional[Dict]:
+        """
+        Get video information for a file, running ffprobe only on a cache miss.
+        
+        Args:
+            file_path: Path to the video file
+            
+        Returns:
+            Dictionary with video information or None if probing failed
+        """
+        key, info = self._lookup(file_path)
+        if key is None or info is not None:
+            return info
+        return self._store(key, VideoUtils._run_ffprobe(file_path))
+    
+    def _lookup(self, file_path: Path) -> Tuple[Optional[Tuple[str, int, int]], Optional[Dict]]:
+        """Return the cache key for a file and its cached information (key is None if unreadable)."""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None, None
+        
+        key = (str(file_path), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            info = self._entries.get(key)
+            if info is not None:
+                self._entries.move_to_end(key)
+        return key, info
+    
+    def _store(self, key: Tuple[str, int, int], info: Optional[Dict]) -> Optional[Dict]:
+        """Cache a successful probe result and return it."""
+        if info is not None:
+            with self._lock:
+                self._entries[key] = info
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return info
+    
+    def prefetch(self, file_paths: Iterable[Path]) -> Dict[Path, Optional[Dict]]:
+        """
+        Probe several files concurrently, filling the cache.
+        
+        Args:
+            file_paths: Paths of the video files to probe
+            
+        Returns:
+            Dictionary mapping each path to its video information (None if probing failed)
+        """
+        file_paths = list(file_paths)
+        if len(file_paths) <= 1:
+            return {path: self.get_info(path) for path in file_paths}
+        
+        # ffprobe does the work in child processes, so one event loop can keep
+        # MAX_PROBE_WORKERS of them running without a thread each
+        return asyncio.run(self._prefetch_async(file_paths))
+    
+    async def _prefetch_async(self, file_paths: List[Path]) -> Dict[Path, Optional[Dict]]:
+        """Probe cache misses concurrently, at most MAX_PROBE_WORKERS at a time."""
+        slots = asyncio.Semaphore(MAX_PROBE_WORKERS)
+        
+        async def probe(file_path: Path) -> Optional[Dict]:
+            key, info = self._lookup(file_path)
+            if key is None or info is not None:
+                return info
+            async with slots:
+                return self._store(key, await VideoUtils._run_ffprobe_async(file_path))
+        
+        results = await asyncio.gather(*(probe(file_path) for file_path in file_paths))
+        return dict(zip(file_paths, results))
+    
+    def clear(self) -> None:
+        """Drop all cached results."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Backs codec and HDR lookups for callers without a cache of their own
+_shared_probe_cache = ProbeCache()
+
+
 def setup_logging(verbose: bool = False) -> None:
     """
     Set up logging configuration.